@@ -1,6 +1,11 @@
 """Source Stitcher - A tool for concatenating source code files."""
 
+import logging
+
 from .version import get_cached_version
 
+# Stay silent when imported as a library; applications configure logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __version__ = get_cached_version()
 __author__ = "YourOrg"
@@ -1,24 +1,36 @@
 """CLI configuration and validation."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Set
 import pathspec
 
 from ..config import FilterSettings, GenerationOptions
-from ..language_definitions import get_language_extensions
+from ..language_definitions import LanguageTables, find_language, get_language_tables
 
 
-@dataclass
+@lru_cache(maxsize=32)
+def _compile_pathspec(path: str, mtime_ns: int, size: int) -> pathspec.PathSpec:
+    """Compile an ignore file, reusing the result while the file is unchanged.
+
+    mtime_ns and size are only part of the cache key, so an edited file
+    gets compiled again.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return pathspec.PathSpec.from_lines("gitwildmatch", f)
+
+
+@dataclass(slots=True, frozen=True)
 class CLIConfig:
-    """Configuration for CLI mode operation."""
+    """Configuration for CLI mode operation; read-only once parsed."""
 
     directory: Path
     output_file: Path
-    include_types: Optional[List[str]] = None
-    exclude_types: Optional[List[str]] = None
-    include_extensions: Optional[List[str]] = None
-    exclude_extensions: Optional[List[str]] = None
+    include_types: List[str] = field(default_factory=list)
+    exclude_types: List[str] = field(default_factory=list)
+    include_extensions: List[str] = field(default_factory=list)
+    exclude_extensions: List[str] = field(default_factory=list)
     respect_gitignore: bool = True
     ignore_file: Optional[Path] = None
     include_hidden: bool = False
@@ -35,36 +47,12 @@ class CLIConfig:
     include_timestamp: bool = True
     overwrite: bool = False
 
-    def __post_init__(self):
-        """Initialize default values for list fields."""
-        if self.include_types is None:
-            self.include_types = []
-        if self.exclude_types is None:
-            self.exclude_types = []
-        if self.include_extensions is None:
-            self.include_extensions = []
-        if self.exclude_extensions is None:
-            self.exclude_extensions = []
-
     def to_filter_settings(self) -> FilterSettings:
         """Convert CLI configuration to FilterSettings object."""
-        language_extensions = get_language_extensions()
-
-        # Start with all known extensions and filenames
-        all_extensions = set()
-        all_filenames = set()
-
-        for lang_name, extensions in language_extensions.items():
-            for ext in extensions:
-                if ext.startswith("."):
-                    all_extensions.add(ext)
-                else:
-                    all_filenames.add(ext.lower())
+        tables = get_language_tables()
 
         # Determine selected extensions and filenames based on CLI filters
-        selected_extensions, selected_filenames = self._calculate_selected_files(
-            language_extensions, all_extensions, all_filenames
-        )
+        selected_extensions, selected_filenames = self._calculate_selected_files(tables)
 
         # Handle ignore patterns
         ignore_spec = None
@@ -74,8 +62,10 @@ class CLIConfig:
             )
             if ignore_path and ignore_path.exists():
                 try:
-                    with open(ignore_path, "r", encoding="utf-8") as f:
-                        ignore_spec = pathspec.PathSpec.from_lines("gitwildmatch", f)
+                    st = ignore_path.stat()
+                    ignore_spec = _compile_pathspec(
+                        str(ignore_path), st.st_mtime_ns, st.st_size
+                    )
                 except Exception:
                     pass  # Ignore errors, will be logged elsewhere
 
@@ -83,10 +73,10 @@ class CLIConfig:
         handle_other_text_files = not self.include_types and not self.include_extensions
 
         return FilterSettings(
-            selected_extensions=selected_extensions,
-            selected_filenames=selected_filenames,
-            all_known_extensions=all_extensions,
-            all_known_filenames=all_filenames,
+            selected_extensions=frozenset(selected_extensions),
+            selected_filenames=frozenset(selected_filenames),
+            all_known_extensions=tables.all_extensions,
+            all_known_filenames=tables.all_filenames,
             handle_other_text_files=handle_other_text_files,
             ignore_spec=ignore_spec,
             global_ignore_spec=None,
@@ -126,38 +116,29 @@ class CLIConfig:
         )
 
     def _calculate_selected_files(
-        self,
-        language_extensions: dict,
-        all_extensions: Set[str],
-        all_filenames: Set[str],
+        self, tables: LanguageTables
     ) -> tuple[Set[str], Set[str]]:
         """Calculate which extensions and filenames should be selected based on CLI filters."""
-        selected_extensions = set()
-        selected_filenames = set()
+        selected_extensions: Set[str] = set()
+        selected_filenames: Set[str] = set()
 
         # If include_types is specified, start with those
         if self.include_types:
             for type_name in self.include_types:
                 # Find matching language (case-insensitive)
-                for lang_name, extensions in language_extensions.items():
-                    if (
-                        type_name.lower() in lang_name.lower()
-                        or lang_name.lower() in type_name.lower()
-                    ):
-                        for ext in extensions:
-                            if ext.startswith("."):
-                                selected_extensions.add(ext)
-                            else:
-                                selected_filenames.add(ext.lower())
-                        break
+                match = find_language(tables, type_name)
+                if match is not None:
+                    selected_extensions |= match[0]
+                    selected_filenames |= match[1]
         else:
             # If no include_types specified, start with all
-            selected_extensions = all_extensions.copy()
-            selected_filenames = all_filenames.copy()
+            selected_extensions = set(tables.all_extensions)
+            selected_filenames = set(tables.all_filenames)
 
         # Add explicitly included extensions
         if self.include_extensions:
             for ext in self.include_extensions:
+                ext = ext.lower()
                 if not ext.startswith("."):
                     ext = "." + ext
                 selected_extensions.add(ext)
@@ -165,21 +146,15 @@ class CLIConfig:
         # Remove excluded types
         if self.exclude_types:
             for type_name in self.exclude_types:
-                for lang_name, extensions in language_extensions.items():
-                    if (
-                        type_name.lower() in lang_name.lower()
-                        or lang_name.lower() in type_name.lower()
-                    ):
-                        for ext in extensions:
-                            if ext.startswith("."):
-                                selected_extensions.discard(ext)
-                            else:
-                                selected_filenames.discard(ext.lower())
-                        break
+                match = find_language(tables, type_name)
+                if match is not None:
+                    selected_extensions -= match[0]
+                    selected_filenames -= match[1]
 
         # Remove explicitly excluded extensions
         if self.exclude_extensions:
             for ext in self.exclude_extensions:
+                ext = ext.lower()
                 if not ext.startswith("."):
                     ext = "." + ext
                 selected_extensions.discard(ext)
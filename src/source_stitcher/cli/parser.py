@@ -1,11 +1,15 @@
 """Command-line argument parsing and validation."""
 
 import argparse
+import os
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from ..language_definitions import get_language_extensions
+from ..language_definitions import find_language, get_language_tables
 from .config import CLIConfig
 from .info import show_supported_file_types, show_version_info
 
@@ -26,13 +30,9 @@ def show_helpful_error(
     sys.exit(2)
 
 
-def parse_cli_arguments() -> Optional[argparse.Namespace]:
-    """
-    Parse command-line arguments.
-
-    Returns:
-        Parsed arguments namespace if CLI arguments are provided, None otherwise.
-    """
+@cache
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once and reuse it for later calls."""
     parser = argparse.ArgumentParser(
         prog="source-stitcher",
         description="""
@@ -77,8 +77,25 @@ For more detailed examples and usage patterns, visit the project documentation.
     # Add all argument definitions
     _add_arguments(parser)
 
+    return parser
+
+
+def parse_cli_arguments() -> Optional[argparse.Namespace]:
+    """
+    Parse command-line arguments.
+
+    Returns:
+        Parsed arguments namespace if CLI arguments are provided, None otherwise.
+    """
+    parser = _get_parser()
+
     # Parse arguments
     args = parser.parse_args()
+    # Split the comma-separated lists once for validation and CLIConfig
+    args.include_types_parsed = _split_csv(args.include_types)
+    args.exclude_types_parsed = _split_csv(args.exclude_types)
+    args.include_extensions_parsed = _split_csv(args.include_extensions)
+    args.exclude_extensions_parsed = _split_csv(args.exclude_extensions)
 
     # Handle information commands
     if args.version:
@@ -135,13 +152,13 @@ def _add_arguments(parser: argparse.ArgumentParser):
     parser.add_argument(
         "--include-types",
         type=str,
-        help="Comma-separated list of file types to include (e.g., 'python,javascript,web')",
+        help="Comma-separated list of file types to include, matched by name or name prefix (e.g., 'python,javascript,web')",
     )
 
     parser.add_argument(
         "--exclude-types",
         type=str,
-        help="Comma-separated list of file types to exclude (e.g., 'documentation,config')",
+        help="Comma-separated list of file types to exclude, matched by name or name prefix (e.g., 'documentation,config')",
     )
 
     # Extension filtering options
@@ -307,11 +324,10 @@ def _validate_arguments(parser: argparse.ArgumentParser, args: argparse.Namespac
         )
 
     # Validate file type arguments
-    if args.include_types and args.exclude_types:
+    if args.include_types_parsed and args.exclude_types_parsed:
         # Check for overlapping types
-        include_set = set(t.strip().lower() for t in args.include_types.split(","))
-        exclude_set = set(t.strip().lower() for t in args.exclude_types.split(","))
-        overlap = include_set.intersection(exclude_set)
+        include_set = {t.lower() for t in args.include_types_parsed}
+        overlap = include_set.intersection(t.lower() for t in args.exclude_types_parsed)
         if overlap:
             show_helpful_error(
                 parser,
@@ -327,6 +343,16 @@ def _validate_arguments(parser: argparse.ArgumentParser, args: argparse.Namespac
     _validate_file_types(parser, args)
 
 
+def _stat_or_none(path: Optional[Path]) -> Optional[os.stat_result]:
+    """Return os.stat() of path, or None if it is unset or cannot be stat'ed."""
+    if path is None:
+        return None
+    try:
+        return path.stat()
+    except (OSError, ValueError):
+        return None
+
+
 def _validate_cli_mode(parser: argparse.ArgumentParser, args: argparse.Namespace):
     """Validate CLI mode specific arguments."""
     if not args.directory:
@@ -341,37 +367,37 @@ def _validate_cli_mode(parser: argparse.ArgumentParser, args: argparse.Namespace
             "--output is required in CLI mode",
             "Specify output file: source-stitcher --cli /path/to/project --output result.md",
         )
-    if not args.directory.exists():
+
+    # The paths are independent, so they are stat'ed concurrently (one stat
+    # each) to overlap round trips on network filesystems
+    output_dir = args.output.parent
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        directory_st, ignore_st, output_dir_st = executor.map(
+            _stat_or_none, [args.directory, args.ignore_file, output_dir]
+        )
+
+    if directory_st is None:
         show_helpful_error(
             parser,
             f"Directory does not exist: {args.directory}",
             "Check the directory path and ensure it exists",
         )
-    if not args.directory.is_dir():
+    elif not stat.S_ISDIR(directory_st.st_mode):
         show_helpful_error(
             parser,
             f"Path is not a directory: {args.directory}",
             "Provide a valid directory path, not a file",
         )
-    if args.ignore_file and not args.ignore_file.exists():
+    if args.ignore_file and ignore_st is None:
         show_helpful_error(
             parser,
             f"Ignore file does not exist: {args.ignore_file}",
             "Check the ignore file path and ensure it exists",
         )
 
-    # Validate output directory is writable
-    output_dir = args.output.parent
-    if not output_dir.exists():
-        try:
-            output_dir.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            show_helpful_error(
-                parser,
-                f"Cannot create output directory: {output_dir}",
-                f"Check permissions and path validity: {e}",
-            )
-    elif not output_dir.is_dir():
+    # A missing output directory is created by the runner when the result is
+    # written; only reject a parent that exists but is not a directory
+    if output_dir_st is not None and not stat.S_ISDIR(output_dir_st.st_mode):
         show_helpful_error(
             parser,
             f"Output path parent is not a directory: {output_dir}",
@@ -381,27 +407,19 @@ def _validate_cli_mode(parser: argparse.ArgumentParser, args: argparse.Namespace
 
 def _validate_file_types(parser: argparse.ArgumentParser, args: argparse.Namespace):
     """Validate file type names if provided."""
-    if args.include_types or args.exclude_types:
-        language_extensions = get_language_extensions()
-        valid_types = [
-            name.lower()
-            for name in language_extensions.keys()
-            if name != "Other Text Files"
-        ]
-
-        for type_arg, arg_name in [
-            (args.include_types, "--include-types"),
-            (args.exclude_types, "--exclude-types"),
+    if args.include_types_parsed or args.exclude_types_parsed:
+        tables = get_language_tables()
+
+        for provided_types, arg_name in [
+            (args.include_types_parsed, "--include-types"),
+            (args.exclude_types_parsed, "--exclude-types"),
         ]:
-            if type_arg:
-                provided_types = [t.strip().lower() for t in type_arg.split(",")]
+            if provided_types:
                 invalid_types = []
                 for ptype in provided_types:
-                    # Check for exact match or partial match
-                    if not any(
-                        ptype in vtype or vtype in ptype for vtype in valid_types
-                    ):
-                        invalid_types.append(ptype)
+                    # Exact or prefix match on a language name or name part
+                    if find_language(tables, ptype) is None:
+                        invalid_types.append(ptype.lower())
 
                 if invalid_types:
                     show_helpful_error(
@@ -411,29 +429,15 @@ def _validate_file_types(parser: argparse.ArgumentParser, args: argparse.Namespa
                     )
 
 
+def _split_csv(value: Optional[str]) -> List[str]:
+    """Split a comma-separated option into stripped, non-empty items."""
+    if not value:
+        return []
+    return [item for item in map(str.strip, value.split(",")) if item]
+
+
 def create_cli_config_from_args(args: argparse.Namespace) -> CLIConfig:
     """Create CLIConfig from parsed arguments."""
-    # Parse comma-separated lists
-    include_types = []
-    if args.include_types:
-        include_types = [t.strip() for t in args.include_types.split(",") if t.strip()]
-
-    exclude_types = []
-    if args.exclude_types:
-        exclude_types = [t.strip() for t in args.exclude_types.split(",") if t.strip()]
-
-    include_extensions = []
-    if args.include_extensions:
-        include_extensions = [
-            e.strip() for e in args.include_extensions.split(",") if e.strip()
-        ]
-
-    exclude_extensions = []
-    if args.exclude_extensions:
-        exclude_extensions = [
-            e.strip() for e in args.exclude_extensions.split(",") if e.strip()
-        ]
-
     # Determine gitignore behavior
     respect_gitignore = not args.no_gitignore
 
@@ -447,10 +451,10 @@ def create_cli_config_from_args(args: argparse.Namespace) -> CLIConfig:
     return CLIConfig(
         directory=args.directory,
         output_file=args.output,
-        include_types=include_types,
-        exclude_types=exclude_types,
-        include_extensions=include_extensions,
-        exclude_extensions=exclude_extensions,
+        include_types=args.include_types_parsed,
+        exclude_types=args.exclude_types_parsed,
+        include_extensions=args.include_extensions_parsed,
+        exclude_extensions=args.exclude_extensions_parsed,
         respect_gitignore=respect_gitignore,
         ignore_file=args.ignore_file,
         include_hidden=args.include_hidden,
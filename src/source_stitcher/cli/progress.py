@@ -1,5 +1,6 @@
 """CLI progress reporting."""
 
+import io
 import logging
 import sys
 import time
@@ -8,6 +9,9 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between writes of buffered progress output to stderr
+_FLUSH_INTERVAL = 0.1
+
 
 class CLIProgressReporter:
     """Progress reporter for CLI mode that connects to worker signals."""
@@ -18,6 +22,9 @@ class CLIProgressReporter:
         self.total_files = 0
         self.processed_files = 0
         self.start_time: Optional[float] = None
+        self._buf = io.StringIO()
+        self._last_flush = 0.0
+        self._last_pct: Optional[int] = None
         logger.debug(
             f"CLIProgressReporter initialized with show_progress={show_progress}, quiet={quiet}"
         )
@@ -25,31 +32,51 @@ class CLIProgressReporter:
     def on_status_updated(self, status: str):
         """Handle status updates from worker."""
         if self.show_progress and not self.quiet:
-            print(f"Status: {status}", file=sys.stderr)
+            self._write(f"Status: {status}\n")
         logger.info(f"Worker status: {status}")
 
     def on_progress_updated(self, progress: int):
         """Handle progress updates from worker."""
+        if progress == self._last_pct:
+            return
+        self._last_pct = progress
         if self.show_progress and not self.quiet:
-            print(f"Progress: {progress}%", file=sys.stderr)
+            self._write(f"Progress: {progress}%\n", force=progress >= 100)
         logger.debug(f"Worker progress updated to {progress}%")
 
     def on_pre_count_finished(self, total_files: int):
         """Handle pre-count completion."""
         self.total_files = total_files
         if self.show_progress and not self.quiet:
-            print(f"Found {total_files} files to process", file=sys.stderr)
+            self._write(f"Found {total_files} files to process\n")
         logger.info(f"Pre-count completed: {total_files} files found")
 
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         logger.debug(f"Processing start time recorded: {self.start_time}")
 
+    def flush(self, now: Optional[float] = None) -> None:
+        """Write out any buffered progress output."""
+        if self._buf.tell():
+            sys.stderr.write(self._buf.getvalue())
+            sys.stderr.flush()
+            self._buf.seek(0)
+            self._buf.truncate()
+        self._last_flush = time.monotonic() if now is None else now
+
+    def _write(self, text: str, force: bool = False) -> None:
+        """Buffer progress output, writing it out at most every _FLUSH_INTERVAL."""
+        self._buf.write(text)
+        # One clock read per event, reused as the new flush timestamp
+        now = time.monotonic()
+        if force or now - self._last_flush > _FLUSH_INTERVAL:
+            self.flush(now)
+
     def get_summary_stats(self, output_file: Path) -> dict:
         """Generate summary statistics for final output."""
         logger.debug("Calculating summary stats...")
         processing_time: float | None = None
-        if self.start_time:
-            processing_time = time.time() - self.start_time
+        if self.start_time is not None:
+            processing_time = time.monotonic() - self.start_time
 
         stats = {
             "total_files_found": self.total_files,
@@ -65,6 +92,7 @@ class CLIProgressReporter:
 
     def print_summary(self, output_file: Path):
         """Print final summary statistics."""
+        self.flush()
         if self.quiet:
             return
 
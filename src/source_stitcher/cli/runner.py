@@ -9,7 +9,7 @@ from typing import Any, List, Optional
 from PyQt6 import QtCore
 
 from ..config import WorkerConfig
-from ..worker import GeneratorWorker
+from ..worker import GeneratorTask
 from .config import CLIConfig
 from .progress import CLIProgressReporter
 
@@ -39,7 +39,7 @@ def run_cli_mode(cli_config: CLIConfig) -> int:
         )
         logger.debug(f"WorkerConfig created: {worker_config}")
 
-        worker = GeneratorWorker(worker_config)
+        worker = GeneratorTask(worker_config)
 
         progress_reporter = CLIProgressReporter(
             show_progress=cli_config.progress, quiet=cli_config.quiet
@@ -65,10 +65,12 @@ def run_cli_mode(cli_config: CLIConfig) -> int:
             completion_state["error"] = error_message
             app.quit()
 
-        worker.status_updated.connect(progress_reporter.on_status_updated)
-        worker.progress_updated.connect(progress_reporter.on_progress_updated)
-        worker.pre_count_finished.connect(progress_reporter.on_pre_count_finished)
-        worker.finished.connect(on_finished)
+        worker.signals.status_updated.connect(progress_reporter.on_status_updated)
+        worker.signals.progress_updated.connect(progress_reporter.on_progress_updated)
+        worker.signals.pre_count_finished.connect(
+            progress_reporter.on_pre_count_finished
+        )
+        worker.signals.finished.connect(on_finished)
 
         logger.debug(f"Filter settings: {filter_settings}")
         logger.debug(f"Generation options: {generation_options}")
@@ -86,6 +88,7 @@ def run_cli_mode(cli_config: CLIConfig) -> int:
         QtCore.QTimer.singleShot(0, worker.run)
 
         app.exec()
+        progress_reporter.flush()
 
         error_msg = completion_state.get("error", "")
         if error_msg:
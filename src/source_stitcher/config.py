@@ -3,7 +3,7 @@
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import pathspec
 
 from .version import get_cached_version, get_cached_app_name
@@ -11,7 +11,7 @@ from .version import get_cached_version, get_cached_app_name
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppSettings:
     """Application-level settings and configuration."""
 
@@ -24,14 +24,14 @@ class AppSettings:
     memory_chunk_size_mb: int = 1
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FilterSettings:
     """File filtering and selection configuration."""
 
-    selected_extensions: Set[str]
-    selected_filenames: Set[str]
-    all_known_extensions: Set[str]
-    all_known_filenames: Set[str]
+    selected_extensions: FrozenSet[str]
+    selected_filenames: FrozenSet[str]
+    all_known_extensions: FrozenSet[str]
+    all_known_filenames: FrozenSet[str]
     handle_other_text_files: bool
     ignore_spec: Optional[pathspec.PathSpec] = None
     global_ignore_spec: Optional[pathspec.PathSpec] = None
@@ -43,7 +43,7 @@ class FilterSettings:
     include_hidden_files: bool = False  # Default OFF for hidden files
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GenerationOptions:
     """Options for file generation and processing."""
 
@@ -61,18 +61,23 @@ class GenerationOptions:
         logger.debug("Initializing GenerationOptions")
         if self.encodings is None:
             logger.debug("Encodings not provided, setting defaults.")
-            self.encodings = [
-                "utf-8",
-                "utf-8-sig",
-                "latin-1",
-                "iso-8859-1",
-                "cp1252",
-                "ascii",
-            ]
+            # Frozen dataclass: defaults are filled in through object.__setattr__
+            object.__setattr__(
+                self,
+                "encodings",
+                [
+                    "utf-8",
+                    "utf-8-sig",
+                    "latin-1",
+                    "iso-8859-1",
+                    "cp1252",
+                    "ascii",
+                ],
+            )
         logger.debug(f"GenerationOptions validation completed: {self}")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UISettings:
     """User interface configuration and state."""
 
@@ -83,7 +88,7 @@ class UISettings:
     auto_expand_directories: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkerConfig:
     """Configuration for the background worker thread."""
 
@@ -93,6 +98,9 @@ class WorkerConfig:
     estimated_total_files: int = 0
     progress_update_interval: int = 10
     language_config_path: Optional[Path] = None
+    # (st_dev, st_ino) -> is binary, filled during discovery and reused when
+    # the files are read so each file is sniffed only once
+    binary_cache: Dict[Tuple[int, int], bool] = field(default_factory=dict)
 
 
 # Token budget options for LLM context limits (using round numbers, not powers of 2)
@@ -1,22 +1,51 @@
 """File reading utilities with encoding detection and error handling."""
 
+import codecs
 import logging
+import os
+import shutil
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-from ..file_utils import is_binary_file
+from ..file_utils import BINARY_SNIFF_SIZE, is_binary_bytes, is_binary_file
 
 logger = logging.getLogger(__name__)
 
+# Characters per read/write when copying a file with copy_into
+_COPY_CHUNK_SIZE = 64 * 1024
+
+# Files read_many keeps in flight ahead of the consumer; the pool is sized
+# to match, so at most this many whole files are held in memory at once
+_READ_AHEAD = 8
+
 
 class FileReader:
     """Handles reading files with multiple encoding fallbacks."""
 
     def __init__(
-        self, encodings: Optional[List[str]] = None, default_encoding: str = "utf-8"
+        self,
+        encodings: Optional[List[str]] = None,
+        default_encoding: str = "utf-8",
+        binary_cache: Optional[Dict[Tuple[int, int], bool]] = None,
     ):
-        """Initialize with encoding preferences."""
+        """Initialize with encoding preferences.
+
+        binary_cache maps (st_dev, st_ino) to an earlier is_binary_file
+        result, so files already sniffed during discovery are not reopened.
+        """
         self.encodings = encodings or [
             "utf-8",
             "utf-8-sig",
@@ -26,50 +55,95 @@ class FileReader:
             "ascii",
         ]
         self.default_encoding = default_encoding
+        self.binary_cache = binary_cache if binary_cache is not None else {}
 
-    def get_file_content(self, filepath: Path) -> Optional[str]:
+    def get_file_content(
+        self, filepath: Path, max_size: Optional[int] = None
+    ) -> Optional[str]:
         """
         Safely read the content of a non-binary text file, trying multiple encodings.
-        Returns None if the file is binary, cannot be read, or causes decoding errors.
+        Returns None if the file is binary, cannot be read, or causes decoding errors,
+        or if it is larger than max_size bytes.
+
+        The file is read once and each encoding is tried on the bytes in
+        memory; a UTF-8 byte order mark moves "utf-8-sig" to the front.
         Catches MemoryError and falls back to chunked reading.
         """
+        content = self._read_content(filepath, max_size)
+        return content if not isinstance(content, int) else None
+
+    def _read_content(
+        self, filepath: Path, max_size: Optional[int] = None
+    ) -> Union[str, int, None]:
+        """get_file_content, returning the size of files over max_size."""
         try:
-            file_size = filepath.stat().st_size
+            st: Optional[os.stat_result] = filepath.stat()
         except (FileNotFoundError, PermissionError) as e:
             logger.warning(f"Could not stat file {filepath.name}: {e}")
-            file_size = 0
+            st = None
+        file_size = st.st_size if st is not None else 0
+        if max_size is not None and file_size > max_size:
+            logger.debug("Not reading %s into memory: %d bytes", filepath, file_size)
+            return file_size
 
-        logger.info(f"Processing file: {filepath.name}")
-        logger.debug(f"Attempting to read file: {filepath.name} ({file_size} bytes)")
+        logger.info("Processing file: %s", filepath.name)
+        logger.debug("Attempting to read file: %s (%d bytes)", filepath.name, file_size)
 
-        if is_binary_file(filepath):
-            logger.info(f"Skipping binary file: {filepath.name}")
+        is_binary = None
+        if st is not None:
+            is_binary = self.binary_cache.get((st.st_dev, st.st_ino))
+        if is_binary:
+            logger.info("Skipping binary file: %s", filepath.name)
             return None
 
+        raw: Optional[bytes] = None
+        try:
+            raw = filepath.read_bytes()
+        except MemoryError:
+            logger.info(f"Fallback to chunked reading for large file: {filepath.name}")
+        except OSError as e:
+            logger.warning(f"Error reading {filepath.name}: {e}")
+            return None
+
+        if is_binary is None:
+            # Same test as is_binary_file, on the bytes already read
+            if raw is not None:
+                is_binary = is_binary_bytes(raw)
+            else:
+                is_binary = is_binary_file(filepath)
+            if st is not None:
+                self.binary_cache[(st.st_dev, st.st_ino)] = is_binary
+        if is_binary:
+            logger.info("Skipping binary file: %s", filepath.name)
+            return None
+
+        encodings = self._encodings_for(raw) if raw is not None else self.encodings
+
         last_error = None
 
-        for encoding in self.encodings:
-            logger.debug(f"Trying encoding: {encoding}")
+        for encoding in encodings:
+            logger.debug("Trying encoding: %s", encoding)
             try:
-                start_time = time.time()
-                try:
-                    content = filepath.read_text(encoding=encoding, errors="strict")
-                except MemoryError:
-                    logger.info(
-                        f"Fallback to chunked reading for large file: {filepath.name}"
-                    )
-                    content = ""
+                start_time = time.monotonic()
+                if raw is not None:
+                    content = raw.decode(encoding)
+                    # read_text() translated newlines; keep doing the same
+                    if "\r" in content:
+                        content = content.replace("\r\n", "\n").replace("\r", "\n")
+                else:
+                    parts: List[str] = []
                     with filepath.open("r", encoding=encoding, errors="strict") as f:
                         for chunk in iter(lambda: f.read(1024 * 1024), ""):
-                            content += chunk
+                            parts.append(chunk)
+                    content = "".join(parts)
 
-                read_time = time.time() - start_time
+                read_time = time.monotonic() - start_time
                 logger.debug(
-                    f"Successfully decoded with {encoding} in {read_time:.3f}s"
+                    "Successfully decoded with %s in %.3fs", encoding, read_time
                 )
 
                 if not content.strip():
-                    logger.info(f"Skipping empty file: {filepath.name}")
+                    logger.info("Skipping empty file: %s", filepath.name)
                     return None
 
                 if logger.isEnabledFor(logging.DEBUG):
@@ -79,7 +153,9 @@ class FileReader:
 
             except UnicodeDecodeError as e:
                 last_error = f"Failed to decode with {encoding}: {e}"
-                logger.debug(f"Encoding {encoding} failed for {filepath.name}: {e}")
+                logger.debug(
+                    "Encoding %s failed for %s: %s", encoding, filepath.name, e
+                )
                 continue
 
             except (PermissionError, FileNotFoundError, OSError) as e:
@@ -91,3 +167,135 @@ class FileReader:
             f"Last error: {last_error}"
         )
         return None
+
+    def copy_into(self, filepath: Path, out: TextIO, header: str = "") -> bool:
+        """
+        Stream a text file into out without holding its content in memory.
+
+        Applies the same checks as get_file_content. One pass decodes the
+        file to pick an encoding and make sure it is not blank, a second one
+        copies it in _COPY_CHUNK_SIZE pieces, so memory use does not grow
+        with the file. header is written just before the content, and only
+        if the content is written. If the file cannot be read to the end
+        after all, the copy stops where it failed.
+
+        Returns:
+            True if the file was copied, False if it was skipped
+        """
+        logger.info("Processing file: %s", filepath.name)
+        try:
+            st = filepath.stat()
+            with filepath.open("rb") as f:
+                head = f.read(BINARY_SNIFF_SIZE)
+        except OSError as e:
+            logger.warning(f"Error reading {filepath.name}: {e}")
+            return False
+
+        key = (st.st_dev, st.st_ino)
+        is_binary = self.binary_cache.get(key)
+        if is_binary is None:
+            is_binary = is_binary_bytes(head)
+            self.binary_cache[key] = is_binary
+        if is_binary:
+            logger.info("Skipping binary file: %s", filepath.name)
+            return False
+
+        chosen: Optional[str] = None
+        last_error = None
+        for encoding in self._encodings_for(head):
+            logger.debug("Trying encoding: %s", encoding)
+            try:
+                has_content = False
+                with filepath.open("r", encoding=encoding, errors="strict") as f:
+                    for chunk in iter(lambda: f.read(_COPY_CHUNK_SIZE), ""):
+                        has_content = has_content or bool(chunk.strip())
+            except UnicodeDecodeError as e:
+                last_error = f"Failed to decode with {encoding}: {e}"
+                logger.debug(
+                    "Encoding %s failed for %s: %s", encoding, filepath.name, e
+                )
+                continue
+            except OSError as e:
+                logger.warning(f"Error reading {filepath.name}: {e}")
+                return False
+            if not has_content:
+                logger.info("Skipping empty file: %s", filepath.name)
+                return False
+            chosen = encoding
+            break
+
+        if chosen is None:
+            logger.warning(
+                f"Skipping file {filepath.name} - could not decode with any encoding. "
+                f"Last error: {last_error}"
+            )
+            return False
+
+        header_written = False
+        try:
+            with filepath.open("r", encoding=chosen, errors="strict") as f:
+                out.write(header)
+                header_written = True
+                shutil.copyfileobj(f, out, _COPY_CHUNK_SIZE)
+        except (OSError, UnicodeDecodeError) as e:
+            # The file changed since it was checked; once the header is out
+            # the section is kept, truncated, so the caller still closes it
+            logger.warning(f"Error copying {filepath.name}: {e}")
+            return header_written
+        return True
+
+    def _encodings_for(self, head: bytes) -> List[str]:
+        """The encodings to try, with "utf-8-sig" first if head has a UTF-8 BOM."""
+        encodings = self.encodings
+        if head.startswith(codecs.BOM_UTF8) and "utf-8-sig" in encodings:
+            encodings = ["utf-8-sig"] + [e for e in encodings if e != "utf-8-sig"]
+        return encodings
+
+    def read_many(
+        self,
+        paths: Sequence[Path],
+        max_workers: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> Iterator[Union[str, int, None]]:
+        """
+        Read files on a thread pool, yielding get_file_content results in order.
+
+        Files larger than max_size bytes are not read; their size is yielded
+        instead, so the caller can copy them with copy_into.
+
+        At most max_workers reads (default _READ_AHEAD) run ahead of the
+        consumer, so memory stays bounded by that many files rather than the
+        whole list. Errors are logged and yielded as None.
+        """
+        if max_workers is None:
+            max_workers = _READ_AHEAD
+        if max_workers <= 1 or len(paths) <= 1:
+            for path in paths:
+                yield self._read_or_none(path, max_size)
+            return
+
+        remaining = iter(paths)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight: Deque[Future] = deque()
+            for path in remaining:
+                in_flight.append(executor.submit(self._read_or_none, path, max_size))
+                if len(in_flight) >= max_workers:
+                    break
+            while in_flight:
+                content = in_flight.popleft().result()
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    in_flight.append(
+                        executor.submit(self._read_or_none, next_path, max_size)
+                    )
+                yield content
+
+    def _read_or_none(
+        self, filepath: Path, max_size: Optional[int] = None
+    ) -> Union[str, int, None]:
+        """_read_content that logs unexpected errors instead of raising."""
+        try:
+            return self._read_content(filepath, max_size)
+        except Exception as e:
+            logger.error(f"Error reading file {filepath}: {e}")
+            return None
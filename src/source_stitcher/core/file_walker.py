@@ -1,18 +1,50 @@
 """Unified file discovery and filtering for Source-Stitcher."""
 
+import functools
 import logging
 import os
 import stat
 import time
 from pathlib import Path
-from typing import Any, Callable, List, Set, Tuple, Optional
-import pathspec
+from typing import Any, Callable, Dict, List, Set, Tuple, Optional
 
 from ..config import WorkerConfig
-from ..file_utils import is_binary_file, load_ignore_patterns, matches_file_type
+from ..file_utils import (
+    build_ignore_matcher,
+    ignore_key,
+    is_binary_file,
+    load_ignore_patterns,
+    matches_file_name,
+    merge_ignore_specs,
+)
 
 logger = logging.getLogger(__name__)
 
+# DirEntry.stat() leaves st_dev/st_ino zeroed on Windows
+_DIRENT_HAS_INODE = os.name != "nt"
+
+
+def _file_id(st: os.stat_result) -> int:
+    """Pack (st_dev, st_ino) into one int for the duplicate set.
+
+    st_dev is shifted past 128 bits, the widest st_ino Python reports
+    (ReFS on Windows), so no two files can share a key.
+    """
+    return (st.st_dev << 128) | st.st_ino
+
+
+def _stat_getter(entry: os.DirEntry) -> Callable[[], os.stat_result]:
+    """
+    Return a function that stats a directory entry, following symlinks.
+
+    On POSIX DirEntry.stat() is a single stat() whose result is cached on the
+    entry. On Windows it is built from the directory listing without real
+    inode numbers, which duplicate detection needs, so os.stat is used there.
+    """
+    if _DIRENT_HAS_INODE:
+        return entry.stat
+    return functools.partial(os.stat, entry.path)
+
 
 class ProjectFileWalker:
     """
@@ -35,6 +67,33 @@ class ProjectFileWalker:
         self.config = config
         self.progress_callback = progress_callback
         self._is_cancelled = False
+        # Selected directories inside another selected path, set per walk
+        self._nested_roots: Set[str] = set()
+        # Project and global specs both match paths relative to the base
+        # directory; merged where possible so each path is matched once
+        specs = [
+            spec
+            for spec in (
+                config.filter_settings.ignore_spec,
+                config.filter_settings.global_ignore_spec,
+            )
+            if spec is not None
+        ]
+        merged_spec = merge_ignore_specs(specs) if specs else None
+        # Each spec compiled once into a single regex for the whole walk
+        self._ignore_matchers: Tuple[Callable[[str], bool], ...] = tuple(
+            build_ignore_matcher(spec) or spec.match_file
+            for spec in ([merged_spec] if merged_spec is not None else specs)
+        )
+        # The settings are frozen, so per-file flags are read once here
+        self._base_directory = config.generation_options.base_directory
+        self._include_hidden = config.filter_settings.include_hidden_files
+        self._handle_other = config.filter_settings.handle_other_text_files
+        self._selected_exts = config.filter_settings.selected_extensions
+        self._selected_names = config.filter_settings.selected_filenames
+        self._all_exts = config.filter_settings.all_known_extensions
+        self._all_names = config.filter_settings.all_known_filenames
+        self._should_include_file = self._build_file_filter()
         logger.debug(f"ProjectFileWalker initialized with config: {config}")
 
     def cancel(self) -> None:
@@ -52,15 +111,21 @@ class ProjectFileWalker:
             - total_count: Total number of files found
         """
         logger.info("Starting unified file discovery phase")
-        start_time = time.time()
+        start_time = time.monotonic()
 
         discovered_files: List[Path] = []
-        seen: Set[Tuple[int, int]] = set()
-
-        # Sort paths for consistent processing order
-        self.config.generation_options.selected_paths.sort(key=lambda p: p.name.lower())
+        seen: Set[int] = set()
+        filter_settings = self.config.filter_settings
+
+        # Sort paths for consistent processing order, leaving the caller's
+        # list as it was
+        selected_paths = sorted(
+            self.config.generation_options.selected_paths,
+            key=lambda p: p.name.lower(),
+        )
+        self._nested_roots = self._find_nested_roots(selected_paths)
 
-        for path in self.config.generation_options.selected_paths:
+        for path in selected_paths:
             if self._is_cancelled:
                 logger.info("File discovery cancelled")
                 break
@@ -76,21 +141,26 @@ class ProjectFileWalker:
                 is_regular_dir = stat.S_ISDIR(st.st_mode)
 
                 if is_regular_file:
-                    if self._should_include_file(path, st, seen):
+                    included = self._should_include_file(
+                        str(path), path.name, lambda: st, seen
+                    )
+                    if included is not None:
                         discovered_files.append(path)
-                        seen.add((st.st_dev, st.st_ino))
-                        logger.debug(f"Added file: {path}")
+                        seen.add(_file_id(st))
+                        logger.debug("Added file: %s", path)
 
                 elif is_regular_dir:
                     if not self._is_directory_ignored(path):
-                        current_dir_ignore_spec = load_ignore_patterns(
-                            path,
-                            use_gitignore=self.config.filter_settings.use_gitignore,
-                            use_npmignore=self.config.filter_settings.use_npmignore,
-                            use_dockerignore=self.config.filter_settings.use_dockerignore,
+                        current_dir_ignore_match = build_ignore_matcher(
+                            load_ignore_patterns(
+                                path,
+                                use_gitignore=filter_settings.use_gitignore,
+                                use_npmignore=filter_settings.use_npmignore,
+                                use_dockerignore=filter_settings.use_dockerignore,
+                            )
                         )
                         dir_files = self._discover_directory_recursive(
-                            path, current_dir_ignore_spec, seen
+                            path, current_dir_ignore_match, seen
                         )
                         discovered_files.extend(dir_files)
                         logger.debug(
@@ -106,7 +176,7 @@ class ProjectFileWalker:
                 )
                 continue
 
-        end_time = time.time()
+        end_time = time.monotonic()
         total_count = len(discovered_files)
         logger.info(
             f"File discovery completed: {total_count} files found in {end_time - start_time:.2f}s"
@@ -114,105 +184,157 @@ class ProjectFileWalker:
 
         return discovered_files, total_count
 
+    def _find_nested_roots(self, paths: List[Path]) -> Set[str]:
+        """
+        Find selected directories that lie inside another selected path.
+
+        Each of them is walked on its own, so walks of enclosing directories
+        skip them instead of traversing the same subtree twice. Only paths
+        with a selected ancestor are stat'ed.
+        """
+        selected = set(paths)
+        nested: Set[str] = set()
+        for path in paths:
+            if not any(parent in selected for parent in path.parents):
+                continue
+            if os.path.isdir(path) and not self._is_directory_ignored(path):
+                nested.add(str(path))
+        if nested:
+            logger.debug(f"Selected directories walked on their own: {nested}")
+        return nested
+
     def _discover_directory_recursive(
         self,
         dir_path: Path,
-        current_dir_ignore_spec: Optional[pathspec.PathSpec],
-        seen: Set[Tuple[int, int]],
+        current_dir_ignore_match: Optional[Callable[[str], bool]],
+        seen: Set[int],
     ) -> List[Path]:
         """
         Recursively discover files in a directory, applying all filtering logic.
 
         Args:
             dir_path: Directory to scan
-            current_dir_ignore_spec: Local ignore patterns for this directory
-            seen: Set of (dev, ino) tuples to avoid duplicate files
+            current_dir_ignore_match: Local ignore matcher for this directory
+            seen: Set of _file_id keys to avoid duplicate files
 
         Returns:
             List of Path objects for matching files in the directory
         """
         discovered_files: List[Path] = []
 
-        def walk_error_handler(error: OSError) -> None:
+        try:
+            dir_relative = dir_path.relative_to(self._base_directory)
+        except ValueError:
             logger.warning(
-                f"Permission/OS error during discovery walk below {dir_path}: {error}"
+                f"Could not make path relative during discovery: {dir_path}. Skipping subtree."
             )
-
-        for root, dirs, files in os.walk(
-            dir_path, topdown=True, onerror=walk_error_handler, followlinks=False
-        ):
+            return discovered_files
+
+        # Directories still to list, popped depth-first so the output order
+        # matches a top-down os.walk with sorted subdirectories. Each carries
+        # its "/"-terminated path relative to the base directory and to
+        # dir_path, so ignore keys are plain string concatenations.
+        base_prefix = f"{dir_relative.as_posix()}/" if dir_relative.parts else ""
+        pending: List[Tuple[str, str, str]] = [(str(dir_path), base_prefix, "")]
+        while pending:
             if self._is_cancelled:
                 break
 
-            root_path = Path(root)
-            logger.debug(f"Discovering files in directory: {root_path}")
-
-            # Sort for consistent processing order
-            dirs.sort(key=str.lower)
-            files.sort(key=str.lower)
+            root, base_prefix, local_prefix = pending.pop()
+            logger.debug("Discovering files in directory: %s", root)
 
             try:
-                root_relative_to_base = root_path.relative_to(
-                    self.config.generation_options.base_directory
-                )
-                root_relative_to_current = root_path.relative_to(dir_path)
-            except ValueError:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError as error:
                 logger.warning(
-                    f"Could not make path relative during discovery: {root_path}. Skipping subtree."
+                    f"Permission/OS error during discovery walk below {dir_path}: {error}"
                 )
-                dirs[:] = []
                 continue
 
+            # The entry type comes from the directory listing; symlinks to
+            # directories are filtered like directories but never descended
+            dir_entries: Dict[str, os.DirEntry] = {}
+            file_entries: List[os.DirEntry] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dir_entries[entry.name] = entry
+                else:
+                    file_entries.append(entry)
+
+            # Sort for consistent processing order
+            dirs = sorted(dir_entries, key=str.lower)
+            file_entries.sort(key=lambda e: e.name.lower())
+
             # Filter directories in-place
             self._filter_directories(
                 dirs,
-                root_relative_to_base,
-                root_relative_to_current,
-                current_dir_ignore_spec,
+                base_prefix,
+                local_prefix,
+                current_dir_ignore_match,
             )
 
-            # Process files in current directory
-            for file_name in files:
+            # Process files in current directory; the checks work on the
+            # entry's strings and a Path is only built for accepted files
+            for entry in file_entries:
                 if self._is_cancelled:
                     break
 
-                full_path = root_path / file_name
-
+                file_name = entry.name
                 try:
-                    st = os.stat(full_path)
-                    if self._should_include_file(
-                        full_path,
-                        st,
+                    st = self._should_include_file(
+                        entry.path,
+                        file_name,
+                        _stat_getter(entry),
                         seen,
-                        current_dir_ignore_spec,
-                        root_relative_to_current,
-                    ):
-                        discovered_files.append(full_path)
-                        seen.add((st.st_dev, st.st_ino))
-                        logger.debug(f"Discovered file: {full_path}")
+                        current_dir_ignore_match,
+                        base_prefix + file_name,
+                        local_prefix + file_name,
+                    )
+                    if st is not None:
+                        discovered_files.append(Path(entry.path))
+                        seen.add(_file_id(st))
+                        logger.debug("Discovered file: %s", entry.path)
                 except (OSError, ValueError) as e:
                     logger.warning(
-                        f"Could not process file during discovery: {full_path}, error: {e}"
+                        f"Could not process file during discovery: {entry.path}, error: {e}"
                     )
                     continue
 
+            for name in reversed(dirs):
+                entry = dir_entries[name]
+                try:
+                    if entry.is_symlink():
+                        continue
+                except OSError:
+                    continue
+                if entry.path in self._nested_roots:
+                    continue
+                pending.append(
+                    (entry.path, f"{base_prefix}{name}/", f"{local_prefix}{name}/")
+                )
+
         return discovered_files
 
     def _filter_directories(
         self,
         dirs: List[str],
-        root_relative_to_base: Path,
-        root_relative_to_current: Path,
-        current_dir_ignore_spec: Optional[pathspec.PathSpec],
+        base_prefix: str,
+        local_prefix: str,
+        current_dir_ignore_match: Optional[Callable[[str], bool]],
     ) -> None:
         """
         Filter directories in-place, removing ignored directories from the list.
 
         Args:
             dirs: List of directory names to filter (modified in-place)
-            root_relative_to_base: Current root path relative to base directory
-            root_relative_to_current: Current root path relative to current directory
-            current_dir_ignore_spec: Local ignore patterns
+            base_prefix: Current root relative to base directory, "/"-terminated
+            local_prefix: Current root relative to current directory, "/"-terminated
+            current_dir_ignore_match: Local ignore matcher
         """
         original_dirs = list(dirs)
         dirs.clear()
@@ -220,9 +342,9 @@ class ProjectFileWalker:
         for d in original_dirs:
             if self._is_directory_ignored_by_name(
                 d,
-                root_relative_to_base,
-                root_relative_to_current,
-                current_dir_ignore_spec,
+                base_prefix,
+                local_prefix,
+                current_dir_ignore_match,
             ):
                 # Silently skip - no need to log every ignored dir
                 continue
@@ -239,44 +361,31 @@ class ProjectFileWalker:
             True if directory should be ignored
         """
         try:
-            rel_path_str = (
-                str(dir_path.relative_to(self.config.generation_options.base_directory))
-                + "/"
+            rel_path_str = ignore_key(
+                dir_path.relative_to(self._base_directory),
+                True,
             )
         except ValueError:
             return False
 
-        # Check project ignore patterns
-        if (
-            self.config.filter_settings.ignore_spec
-            and self.config.filter_settings.ignore_spec.match_file(rel_path_str)
-        ):
-            return True
-
-        # Check global ignore patterns
-        if (
-            self.config.filter_settings.global_ignore_spec
-            and self.config.filter_settings.global_ignore_spec.match_file(rel_path_str)
-        ):
-            return True
-
-        return False
+        # Check project and global ignore patterns
+        return any(match(rel_path_str) for match in self._ignore_matchers)
 
     def _is_directory_ignored_by_name(
         self,
         dir_name: str,
-        root_relative_to_base: Path,
-        root_relative_to_current: Path,
-        current_dir_ignore_spec: Optional[pathspec.PathSpec],
+        base_prefix: str,
+        local_prefix: str,
+        current_dir_ignore_match: Optional[Callable[[str], bool]],
     ) -> bool:
         """
         Check if a directory should be ignored based on various ignore patterns.
 
         Args:
             dir_name: Name of the directory
-            root_relative_to_base: Current root path relative to base directory
-            root_relative_to_current: Current root path relative to current directory
-            current_dir_ignore_spec: Local ignore patterns
+            base_prefix: Current root relative to base directory, "/"-terminated
+            local_prefix: Current root relative to current directory, "/"-terminated
+            current_dir_ignore_match: Local ignore matcher
 
         Returns:
             True if directory should be ignored
@@ -286,126 +395,141 @@ class ProjectFileWalker:
             return True
 
         # Skip hidden directories unless explicitly requested
-        if (
-            dir_name.startswith(".")
-            and not self.config.filter_settings.include_hidden_files
-        ):
+        if dir_name.startswith(".") and not self._include_hidden:
             return True
 
-        full_dir_path_str = str(root_relative_to_base / dir_name) + "/"
+        full_dir_path_str = f"{base_prefix}{dir_name}/"
 
-        # Check project ignore patterns
-        if (
-            self.config.filter_settings.ignore_spec
-            and self.config.filter_settings.ignore_spec.match_file(full_dir_path_str)
-        ):
-            return True
+        # Check project and global ignore patterns
+        for match in self._ignore_matchers:
+            if match(full_dir_path_str):
+                return True
 
         # Check local ignore patterns
-        if current_dir_ignore_spec and current_dir_ignore_spec.match_file(
-            str(root_relative_to_current / dir_name) + "/"
-        ):
-            return True
-
-        # Check global ignore patterns
-        if (
-            self.config.filter_settings.global_ignore_spec
-            and self.config.filter_settings.global_ignore_spec.match_file(
-                full_dir_path_str
-            )
+        if current_dir_ignore_match and current_dir_ignore_match(
+            f"{local_prefix}{dir_name}/"
         ):
             return True
 
         return False
 
-    def _should_include_file(
-        self,
-        file_path: Path,
-        st: os.stat_result,
-        seen: Set[Tuple[int, int]],
-        current_dir_ignore_spec: Optional[pathspec.PathSpec] = None,
-        root_relative_to_current: Optional[Path] = None,
-    ) -> bool:
+    def _build_file_filter(self) -> Callable[..., Optional[os.stat_result]]:
         """
-        Determine if a file should be included based on all filtering criteria.
+        Build the per-file filter, specialised for this walk's settings.
 
-        Args:
-            file_path: Path to the file
-            st: File stat result
-            seen: Set of (dev, ino) tuples to avoid duplicates
-            current_dir_ignore_spec: Local ignore patterns (for directory traversal)
-            root_relative_to_current: Root path relative to current directory (for directory traversal)
+        The settings cannot change during a walk, so everything the filter
+        needs is bound as closure locals and checks that cannot apply, such
+        as an absent ignore spec, are left out up front.
 
         Returns:
-            True if file should be included
+            Function with the signature documented on should_include_file
         """
-        # Skip non-regular files and empty files
-        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
-            return False
-
-        # Skip hidden files unless explicitly requested
-        if (
-            file_path.name.startswith(".")
-            and not self.config.filter_settings.include_hidden_files
-        ):
-            return False
-
-        # Check for duplicate files (same inode)
-        dev_ino = (st.st_dev, st.st_ino)
-        if dev_ino in seen:
-            return False
-
-        try:
-            relative_path_to_base = file_path.relative_to(
-                self.config.generation_options.base_directory
-            )
-        except ValueError:
-            logger.warning(f"Could not make file path relative: {file_path}")
-            return False
-
-        relative_path_str = str(relative_path_to_base)
-
-        # Check project ignore patterns
-        if (
-            self.config.filter_settings.ignore_spec
-            and self.config.filter_settings.ignore_spec.match_file(relative_path_str)
-        ):
-            return False
-
-        # Check local ignore patterns (only during directory traversal)
-        if current_dir_ignore_spec and root_relative_to_current is not None:
-            try:
-                relative_path_to_current = file_path.relative_to(
-                    self.config.generation_options.base_directory
-                    / root_relative_to_current
-                )
-                if current_dir_ignore_spec.match_file(str(relative_path_to_current)):
-                    return False
-            except ValueError:
-                pass
-
-        # Check global ignore patterns
-        if (
-            self.config.filter_settings.global_ignore_spec
-            and self.config.filter_settings.global_ignore_spec.match_file(
-                relative_path_str
-            )
-        ):
-            return False
+        include_hidden = self._include_hidden
+        handle_other = self._handle_other
+        selected_exts = self._selected_exts
+        selected_names = self._selected_names
+        all_exts = self._all_exts
+        all_names = self._all_names
+        base_directory = self._base_directory
+        binary_cache = self.config.binary_cache
+        base_matchers = self._ignore_matchers
+
+        def should_include_file(
+            file_path: str,
+            file_name: str,
+            stat_file: Callable[[], os.stat_result],
+            seen: Set[int],
+            current_dir_ignore_match: Optional[Callable[[str], bool]] = None,
+            relative_path: Optional[str] = None,
+            local_relative_path: Optional[str] = None,
+        ) -> Optional[os.stat_result]:
+            """
+            Determine if a file should be included based on all filtering criteria.
+
+            Checks on the name and path strings run first; the file is only
+            stat'ed once none of them has rejected it.
+
+            Args:
+                file_path: Path to the file, as a string
+                file_name: Final component of file_path
+                stat_file: Returns the file's stat result (following symlinks)
+                seen: Set of _file_id keys to avoid duplicates
+                current_dir_ignore_match: Local ignore matcher (for directory traversal)
+                relative_path: Path relative to base directory; derived from file_path if omitted
+                local_relative_path: Path relative to current directory (for directory traversal)
+
+            Returns:
+                The file's stat result if it should be included, otherwise None
+
+            Raises:
+                OSError: If the file cannot be stat'ed
+            """
+            # Skip hidden files unless explicitly requested
+            if not include_hidden and file_name.startswith("."):
+                return None
+
+            # Without "other" files the type check is a plain name/extension
+            # lookup, so most files are rejected here before any ignore matching
+            name_lower = file_name.lower()
+            if not handle_other and not matches_file_name(
+                file_path,
+                name_lower,
+                selected_exts,
+                selected_names,
+                all_exts,
+                all_names,
+                False,
+            ):
+                return None
 
-        # Check file type matching
-        if not matches_file_type(
-            file_path,
-            self.config.filter_settings.selected_extensions,
-            self.config.filter_settings.selected_filenames,
-            self.config.filter_settings.all_known_extensions,
-            self.config.filter_settings.all_known_filenames,
-            self.config.filter_settings.handle_other_text_files,
-        ):
-            return False
+            if relative_path is None:
+                try:
+                    relative_path = str(Path(file_path).relative_to(base_directory))
+                except ValueError:
+                    logger.warning(f"Could not make file path relative: {file_path}")
+                    return None
+
+            # Check project and global ignore patterns
+            for match in base_matchers:
+                if match(relative_path):
+                    return None
+
+            # Check local ignore patterns (only during directory traversal)
+            if (
+                current_dir_ignore_match
+                and local_relative_path is not None
+                and current_dir_ignore_match(local_relative_path)
+            ):
+                return None
+
+            st = stat_file()
+
+            # Skip non-regular files and empty files
+            if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+                return None
+
+            # Check for duplicate files (same inode)
+            if _file_id(st) in seen:
+                return None
+
+            # Check file type matching; "other" files may need a content sniff
+            if handle_other and not matches_file_name(
+                file_path,
+                name_lower,
+                selected_exts,
+                selected_names,
+                all_exts,
+                all_names,
+                True,
+            ):
+                return None
 
-        # Check if file is binary
-        if is_binary_file(file_path):
-            return False
+            # Check if file is binary; results are remembered per physical file
+            key = (st.st_dev, st.st_ino)
+            is_binary = binary_cache.get(key)
+            if is_binary is None:
+                is_binary = is_binary_file(Path(file_path))
+                binary_cache[key] = is_binary
+            return None if is_binary else st
 
-        return True
+        return should_include_file
@@ -1,26 +1,35 @@
 """Language definition loader for external TOML configuration."""
 
+import io
+import json
 import logging
+from pathlib import Path
 from types import ModuleType
-from typing import Optional
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple, Union
 
-tomllib: Optional[ModuleType] = None
-try:
-    import tomllib  # type: ignore[import-not-found]
-except ImportError:
-    pass
+from ..file_utils import split_suffix
 
-try:
-    import tomli as _tomllib  # type: ignore[import-not-found]
+logger = logging.getLogger(__name__)
 
-    tomllib = _tomllib
-except ImportError:
-    pass
+# Built-in seed used when the TOML file cannot be loaded or created
+_MINIMAL_SEED_DEFINITIONS: Dict[str, Dict[str, Union[List[str], str]]] = {
+    "Python": {
+        "extensions": [".py"],
+        "filenames": ["pyproject.toml", "requirements.txt"],
+        "description": "Python source files and configuration",
+    },
+    "Other Text Files": {
+        "extensions": [],
+        "filenames": ["*other*"],
+        "description": "Other text files",
+    },
+}
 
-from pathlib import Path
-from typing import Dict, List, Set, Optional, Union, cast
 
-logger = logging.getLogger(__name__)
+def _toml_string(value: str) -> str:
+    """Quote a value as a TOML basic string, escaping quotes and backslashes."""
+    # JSON string escapes are a subset of TOML basic string escapes
+    return json.dumps(value, ensure_ascii=False)
 
 
 class LanguageDefinitionLoader:
@@ -32,6 +41,9 @@ class LanguageDefinitionLoader:
     (derived from a minimal built-in seed) and then load from it.
     """
 
+    # TOML parser module, imported on the first load rather than at import
+    _tomllib: Optional[ModuleType] = None
+
     def __init__(self, config_path: Optional[Path] = None):
         """
         Initialize the language definition loader.
@@ -42,6 +54,17 @@ class LanguageDefinitionLoader:
         """
         self.config_path = config_path or Path("language_definitions.toml")
         self._definitions: Optional[Dict[str, Dict[str, Union[List[str], str]]]] = None
+        # Per-language items, pre-split once at load time by their leading dot
+        self._extensions_by_lang: Dict[str, List[str]] = {}
+        self._filenames_by_lang: Dict[str, List[str]] = {}
+        # The same split, lowercased: language -> (extensions, filenames)
+        self._normalized: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+        # Languages whose definition carries the "*other*" sentinel
+        self._other_languages: Set[str] = set()
+        # Lowercased extension/filename -> first language defining it
+        self._ext_to_lang: Dict[str, str] = {}
+        self._name_to_lang: Dict[str, str] = {}
+        self._language_order: Dict[str, int] = {}
         logger.debug(
             f"LanguageDefinitionLoader initialized with config path: {self.config_path}"
         )
@@ -70,17 +93,70 @@ class LanguageDefinitionLoader:
                     data = self._get_minimal_seed_definitions()
 
             self._definitions = data
+            self._split_definitions()
 
         # Convert TOML structure to the expected format
-        result: Dict[str, List[str]] = {}
-        for lang_name, lang_data in self._definitions.items():
-            extensions = list(lang_data.get("extensions", []))  # type: ignore[assignment]
-            filenames = list(lang_data.get("filenames", []))  # type: ignore[assignment]
-            result[lang_name] = extensions + filenames
+        result: Dict[str, List[str]] = {
+            lang_name: self._extensions_by_lang[lang_name]
+            + self._filenames_by_lang[lang_name]
+            for lang_name in self._definitions
+        }
 
         logger.debug(f"Loaded definitions for {len(result)} languages")
         return result
 
+    def _split_definitions(self) -> None:
+        """
+        Classify every definition item as an extension or a filename once.
+
+        The "*other*" sentinel is scrubbed here so lookups never have to test
+        for it; languages that carried it are recorded separately. Items are
+        lowercased here, once, and the extension/filename -> language
+        dictionaries and the sets of all extensions and filenames are built
+        in the same pass.
+        """
+        assert self._definitions is not None
+        self._extensions_by_lang = {}
+        self._filenames_by_lang = {}
+        self._normalized = {}
+        self._other_languages = set()
+        ext_to_lang: Dict[str, str] = {}
+        name_to_lang: Dict[str, str] = {}
+
+        for lang_name, lang_data in self._definitions.items():
+            extensions: List[str] = []
+            filenames: List[str] = []
+            items = list(lang_data.get("extensions", [])) + list(
+                lang_data.get("filenames", [])
+            )
+            for item in items:
+                if item == "*other*":
+                    self._other_languages.add(lang_name)
+                elif item.startswith("."):
+                    extensions.append(item)
+                else:
+                    filenames.append(item)
+            self._extensions_by_lang[lang_name] = extensions
+            self._filenames_by_lang[lang_name] = filenames
+            lower_exts = [ext.lower() for ext in extensions]
+            lower_names = [name.lower() for name in filenames]
+            self._normalized[lang_name] = (
+                frozenset(lower_exts),
+                frozenset(lower_names),
+            )
+            for ext in lower_exts:
+                ext_to_lang.setdefault(ext, lang_name)
+            for name in lower_names:
+                name_to_lang.setdefault(name, lang_name)
+
+        self._language_order = {name: i for i, name in enumerate(self._definitions)}
+        self._ext_to_lang = ext_to_lang
+        self._name_to_lang = name_to_lang
+        logger.debug(
+            f"Built language lookup tables: {len(ext_to_lang)} extensions, "
+            f"{len(name_to_lang)} filenames"
+        )
+
     def _load_from_toml(self) -> Optional[Dict[str, Dict[str, Union[List[str], str]]]]:
         """
         Load language definitions from TOML file.
@@ -93,11 +169,12 @@ class LanguageDefinitionLoader:
             return None
 
         try:
+            tomllib = self._get_tomllib()
             if tomllib is None:
                 logger.error("tomllib is not available")
                 return None
             with open(self.config_path, "rb") as f:
-                data = cast(ModuleType, tomllib).load(f)
+                data = tomllib.load(f)
 
             logger.info(
                 f"Successfully loaded language definitions from {self.config_path}"
@@ -108,63 +185,87 @@ class LanguageDefinitionLoader:
             logger.error(f"Error loading TOML config from {self.config_path}: {e}")
             return None
 
+    @classmethod
+    def _get_tomllib(cls) -> Optional[ModuleType]:
+        """
+        Import the TOML parser on first use, falling back to tomli.
+
+        Returns:
+            The tomllib (or tomli) module, or None if neither is installed
+        """
+        if cls._tomllib is None:
+            try:
+                import tomllib  # type: ignore[import-not-found]
+
+                cls._tomllib = tomllib
+            except ImportError:
+                try:
+                    import tomli  # type: ignore[import-not-found]
+                except ImportError:
+                    return None
+                cls._tomllib = tomli
+        return cls._tomllib
+
     def _get_minimal_seed_definitions(
         self,
     ) -> Dict[str, Dict[str, Union[List[str], str]]]:
         """
         Provide a minimal built-in seed of definitions to keep the app operational
         if TOML cannot be loaded or created for any reason.
+
+        The seed is a module-level constant and must not be mutated.
         """
-        return {
-            "Python": {
-                "extensions": [".py"],
-                "filenames": ["pyproject.toml", "requirements.txt"],
-                "description": "Python source files and configuration",
-            },
-            "Other Text Files": {
-                "extensions": [],
-                "filenames": ["*other*"],
-                "description": "Other text files",
-            },
-        }
+        return _MINIMAL_SEED_DEFINITIONS
 
-    def get_all_extensions(self) -> Set[str]:
+    def get_other_languages(self) -> Set[str]:
         """
-        Get all known file extensions from loaded definitions.
+        Get the language categories that handle otherwise unmatched text files.
 
         Returns:
-            Set of all file extensions (including the dot)
+            Set of language names whose definition contained the "*other*" sentinel
         """
-        definitions = self.load_definitions()
-        extensions = set()
+        self.load_definitions()
+        return set(self._other_languages)
 
-        for items in definitions.values():
-            for item in items:
-                if item.startswith("."):
-                    extensions.add(item)
+    def get_normalized_definitions(
+        self,
+    ) -> Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """
+        Get each language's extensions and filenames, lowercased.
 
-        logger.debug(f"Found {len(extensions)} unique extensions")
-        return extensions
+        Returns:
+            Mapping of language name -> (extensions, filenames); callers must
+            treat it as read-only
+        """
+        if self._definitions is None:
+            self.load_definitions()
+        return self._normalized
 
-    def get_all_filenames(self) -> Set[str]:
+    def get_all_extensions(self) -> FrozenSet[str]:
         """
-        Get all known special filenames from loaded definitions.
+        Get all known file extensions from loaded definitions.
 
         Returns:
-            Set of all special filenames (without extensions)
+            Set of all file extensions (including the dot), lowercased
         """
-        definitions = self.load_definitions()
-        filenames = set()
+        return frozenset(
+            ext
+            for exts, _ in self.get_normalized_definitions().values()
+            for ext in exts
+        )
 
-        for items in definitions.values():
-            for item in items:
-                if not item.startswith(".") and item != "*other*":
-                    filenames.add(
-                        item.lower()
-                    )  # Store in lowercase for case-insensitive matching
+    def get_all_filenames(self) -> FrozenSet[str]:
+        """
+        Get all known special filenames from loaded definitions.
 
-        logger.debug(f"Found {len(filenames)} unique filenames")
-        return filenames
+        Returns:
+            Set of all special filenames (without extensions), lowercased
+        """
+        return frozenset(
+            name
+            for _, names in self.get_normalized_definitions().values()
+            for name in names
+        )
 
     def get_language_for_file(self, file_path: Path) -> Optional[str]:
         """
@@ -176,22 +277,19 @@ class LanguageDefinitionLoader:
         Returns:
             Language name or None if no match found
         """
-        definitions = self.load_definitions()
-        file_ext = file_path.suffix.lower()
-        file_name = file_path.name.lower()
+        if self._definitions is None:
+            self.load_definitions()
 
-        for lang_name, items in definitions.items():
-            for item in items:
-                if item.startswith(".") and item.lower() == file_ext:
-                    return lang_name
-                elif (
-                    not item.startswith(".")
-                    and item != "*other*"
-                    and item.lower() == file_name
-                ):
-                    return lang_name
+        # The suffix is taken from the lowercased name rather than lowering
+        # Path.suffix separately
+        name = file_path.name.lower()
+        ext_lang = self._ext_to_lang.get(split_suffix(name))
+        name_lang = self._name_to_lang.get(name)
+        if ext_lang is None or name_lang is None:
+            return ext_lang or name_lang
 
-        return None
+        # Both matched: the language defined first wins, as in the TOML order
+        return min(ext_lang, name_lang, key=self._language_order.__getitem__)
 
     def create_default_toml_file(self, output_path: Optional[Path] = None) -> Path:
         """
@@ -212,39 +310,43 @@ class LanguageDefinitionLoader:
             existing if existing is not None else self._get_minimal_seed_definitions()
         )
 
-        # Create TOML content
-        toml_content = [
-            "# Source-Stitcher Language Definitions",
-            "# Users can customize this file to add or modify supported file types",
-            "# Each language section can have 'extensions', 'filenames', and 'description' fields",
-            "",
-        ]
+        # Build the whole document in memory and write it in one go, so a
+        # failure part-way through cannot leave a truncated file behind
+        buf = io.StringIO()
+        buf.write("# Source-Stitcher Language Definitions\n")
+        buf.write(
+            "# Users can customize this file to add or modify supported file types\n"
+        )
+        buf.write(
+            "# Each language section can have 'extensions', 'filenames', and 'description' fields\n"
+        )
+        buf.write("\n")
 
         for lang_name, lang_data in definitions.items():
             # Clean up language name for TOML section
             section_name = (
                 lang_name.replace("/", "_").replace(" ", "_").replace("-", "_")
             )
-            toml_content.append(f"[{section_name}]")
+            buf.write(f"[{section_name}]\n")
 
             if lang_data.get("extensions"):
-                ext_list = ", ".join(f'"{ext}"' for ext in lang_data["extensions"])
-                toml_content.append(f"extensions = [{ext_list}]")
+                ext_list = ", ".join(
+                    map(_toml_string, lang_data["extensions"])
+                )
+                buf.write(f"extensions = [{ext_list}]\n")
 
             if lang_data.get("filenames"):
-                filename_list = ", ".join(
-                    f'"{name}"' for name in lang_data["filenames"]
-                )
-                toml_content.append(f"filenames = [{filename_list}]")
+                filename_list = ", ".join(map(_toml_string, lang_data["filenames"]))
+                buf.write(f"filenames = [{filename_list}]\n")
 
             if lang_data.get("description"):
-                toml_content.append(f'description = "{lang_data["description"]}"')
+                buf.write(
+                    f"description = {_toml_string(str(lang_data['description']))}\n"
+                )
 
-            toml_content.append("")
+            buf.write("\n")
 
-        # Write to file
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(toml_content))
+        output_path.write_text(buf.getvalue(), encoding="utf-8")
 
         logger.info(f"Created default TOML configuration file: {output_path}")
         return output_path
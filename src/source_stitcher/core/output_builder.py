@@ -1,16 +1,130 @@
 """Output building components for streaming file content efficiently."""
 
+import io
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, TextIO, Optional, Callable, Tuple
+from typing import Dict, List, TextIO, Optional, Callable, Tuple
 
 from .tree_generator import ProjectTreeGenerator
 from .file_reader import FileReader
 
 logger = logging.getLogger(__name__)
 
+# Files larger than this are copied into the output in chunks instead of
+# being read into memory first
+_STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Below this many top-level subdirectories the directory size is computed
+# on the calling thread; the pool would cost more than it saves
+_PARALLEL_SIZE_MIN_DIRS = 4
+
+# Seconds a computed directory size is reused for the same root and root
+# mtime, so back-to-back generations skip the walk without going stale
+_DIRECTORY_SIZE_TTL = 30.0
+
+# Root -> (root mtime_ns, time.monotonic() when computed, total bytes)
+_directory_size_cache: Dict[str, Tuple[int, float, int]] = {}
+
+# Ends the header's tree section and opens the concatenated content
+_CONTENT_START = (
+    "\n```\n\n" + "=" * 60 + "\nSTART OF CONCATENATED CONTENT\n" + "=" * 60 + "\n"
+)
+
+# Closes the concatenated content after the last file
+_CONTENT_FOOTER = "\n" + "=" * 60 + "\nEND OF CONCATENATED CONTENT\n" + "=" * 60 + "\n"
+
+
+def _scan_directory_level(path: str, subdirs: List[str]) -> int:
+    """
+    Sum the sizes of the files directly inside one directory.
+
+    Hidden entries and node_modules are skipped. Directory symlinks are not
+    followed; file symlinks count with their target's size. Unreadable
+    directories count as empty.
+
+    Args:
+        path: Directory to list
+        subdirs: List that the directory's subdirectories are appended to
+
+    Returns:
+        Total size in bytes of the directory's files
+    """
+    total = 0
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return 0
+    with it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name != "node_modules":
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    total += entry.stat().st_size
+            except OSError:
+                continue
+    return total
+
+
+def _directory_tree_size(path: str) -> int:
+    """Sum the file sizes of a whole directory tree, as _scan_directory_level."""
+    total = 0
+    stack = [path]
+    while stack:
+        total += _scan_directory_level(stack.pop(), stack)
+    return total
+
+
+def _cached_directory_size(root: str, mtime_ns: int) -> int:
+    """
+    _directory_size, reused for _DIRECTORY_SIZE_TTL seconds while the
+    root's mtime_ns stays the same.
+    """
+    now = time.monotonic()
+    cached = _directory_size_cache.get(root)
+    if (
+        cached is not None
+        and cached[0] == mtime_ns
+        and now - cached[1] < _DIRECTORY_SIZE_TTL
+    ):
+        return cached[2]
+    total = _directory_size(root)
+    # Expired entries are dropped here so the cache does not grow unbounded
+    for key, (_, computed_at, _) in list(_directory_size_cache.items()):
+        if now - computed_at >= _DIRECTORY_SIZE_TTL:
+            del _directory_size_cache[key]
+    _directory_size_cache[root] = (mtime_ns, now, total)
+    return total
+
+
+def _directory_size(root: str) -> int:
+    """
+    Sum the file sizes under root.
+
+    Each top-level subdirectory is sized on its own pool thread, since the
+    walk is dominated by scandir/stat calls that release the GIL.
+    """
+    total = 0
+    try:
+        subdirs: List[str] = []
+        total = _scan_directory_level(root, subdirs)
+        if len(subdirs) < _PARALLEL_SIZE_MIN_DIRS:
+            return total + sum(map(_directory_tree_size, subdirs))
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            total += sum(executor.map(_directory_tree_size, subdirs))
+    except Exception as e:
+        logger.warning(f"Error computing directory size for {root}: {e}")
+    return total
+
 
 class HeaderBuilder:
     """Builds the complete markdown header before any file content is written."""
@@ -43,66 +157,45 @@ class HeaderBuilder:
         total_bytes = self._compute_directory_size(self.base_dir)
         human_size = self._format_size(total_bytes)
 
-        # Build header components
-        header_lines = [
-            f"# Concatenated Files from: {self.base_dir}",
-            f"# Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"# Total directory size: {human_size}",
-        ]
+        # Build header components; the tree can be large, so everything is
+        # written into one buffer instead of joining a list of lines
+        buf = io.StringIO()
+        buf.write(f"# Concatenated Files from: {self.base_dir}\n")
+        buf.write(f"# Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buf.write(f"# Total directory size: {human_size}\n")
 
         # Add selected file types info
         if not self.selected_langs:
-            header_lines.append("# Selected file types: All types")
+            buf.write("# Selected file types: All types\n")
         else:
-            header_lines.append(
-                f"# Selected file types: {', '.join(self.selected_langs)}"
-            )
+            buf.write(f"# Selected file types: {', '.join(self.selected_langs)}\n")
 
         # Add tree section
-        header_lines.extend(
-            [
-                "",
-                "# Selected Files",
-                "```",
-                tree,
-                "```",
-                "",
-                "=" * 60,
-                "START OF CONCATENATED CONTENT",
-                "=" * 60,
-                "",
-            ]
-        )
+        buf.write("\n# Selected Files\n```\n")
+        buf.write(tree)
+        buf.write(_CONTENT_START)
 
-        return "\n".join(header_lines)
+        return buf.getvalue()
 
     def _compute_directory_size(self, root: Path) -> int:
         """Compute total size of directory in bytes.
 
+        A total is reused for a short time while the root's modification
+        time is unchanged, so generating the same project again right away
+        does not walk it again.
+
         Args:
             root: Root directory to compute size for
 
         Returns:
             Total size in bytes
         """
-        total = 0
         try:
-            for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
-                dirnames[:] = [
-                    d for d in dirnames if d != "node_modules" and not d.startswith(".")
-                ]
-                for name in filenames:
-                    if name.startswith("."):
-                        continue
-                    fp = Path(dirpath) / name
-                    try:
-                        if fp.is_file():
-                            total += fp.stat().st_size
-                    except (OSError, PermissionError):
-                        continue
-        except Exception as e:
+            mtime_ns = root.stat().st_mtime_ns
+        except OSError as e:
             logger.warning(f"Error computing directory size for {root}: {e}")
-        return total
+            return 0
+        return _cached_directory_size(os.fspath(root), mtime_ns)
 
     def _format_size(self, num_bytes: int) -> str:
         """Format bytes as human-readable string.
@@ -153,12 +246,16 @@ class ContentStreamer:
         total = len(files)
         processed_count = 0
         processed_files = []
+        # Progress is only reported when the whole percentage changes
+        last_pct = -1
 
-        for idx, path in enumerate(files, 1):
+        # Files are read ahead on a thread pool but written in list order;
+        # large files come back as their size and are copied here instead
+        contents = self.reader.read_many(files, max_size=_STREAM_THRESHOLD_BYTES)
+        for idx, (path, content) in enumerate(zip(files, contents), 1):
             try:
-                content = self.reader.get_file_content(path)
                 if content is None:
-                    logger.debug(f"Skipping file with no content: {path}")
+                    logger.debug("Skipping file with no content: %s", path)
                     continue
 
                 # Calculate relative path and language
@@ -170,27 +267,33 @@ class ContentStreamer:
 
                 lang = path.suffix[1:] if path.suffix else "txt"
 
-                # Write file section
-                self.out.write(f"\n--- File: {rel_path} ---\n")
-                self.out.write(f"```{lang}\n")
-                self.out.write(content)
-                self.out.write("\n```\n")
+                # Write file section; content goes out as is, never
+                # concatenated into a bigger string first
+                header = f"\n--- File: {rel_path} ---\n```{lang}\n"
+                if isinstance(content, str):
+                    self.out.writelines((header, content, "\n```\n"))
+                elif self.reader.copy_into(path, self.out, header):
+                    self.out.write("\n```\n")
+                else:
+                    logger.debug("Skipping file with no content: %s", path)
+                    continue
 
                 processed_count += 1
                 processed_files.append(path)
 
                 # Update progress
-                if progress_cb and total > 0:
-                    progress_cb(int(idx / total * 100))
+                if progress_cb:
+                    pct = idx * 100 // total
+                    if pct != last_pct:
+                        last_pct = pct
+                        progress_cb(pct)
 
             except Exception as e:
                 logger.error(f"Error streaming file {path}: {e}")
                 continue
 
         # Write footer
-        self.out.write("\n" + "=" * 60 + "\n")
-        self.out.write("END OF CONCATENATED CONTENT\n")
-        self.out.write("=" * 60 + "\n")
+        self.out.write(_CONTENT_FOOTER)
 
         logger.info(
             f"Content streaming completed: {processed_count}/{total} files processed"
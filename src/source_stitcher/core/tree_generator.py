@@ -1,11 +1,15 @@
 """Tree structure generation for displaying selected files."""
 
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# A directory in the tree: (subdirectories by name, file names)
+_TreeNode = Tuple[Dict[str, "_TreeNode"], List[str]]
+
 
 class ProjectTreeGenerator:
     """Generates ASCII tree representation of selected files."""
@@ -30,24 +34,31 @@ class ProjectTreeGenerator:
         if not file_paths:
             return ""
 
-        # Convert absolute paths to relative and sort
-        relative_paths = []
-        seen_paths: Set[str] = set()
+        # Relative paths are taken as the parts below the base directory,
+        # deduplicated, then sorted case-insensitively as full paths
+        base_parts = self.base_directory.parts
+        depth = len(base_parts)
+        unique_parts: Dict[Tuple[str, ...], None] = {}
 
-        for path in sorted(file_paths, key=lambda p: str(p).lower()):
+        for path in file_paths:
+            parts = path.parts
+            if parts[:depth] == base_parts:
+                unique_parts[parts[depth:]] = None
+                continue
+            # relative_to also handles what a plain prefix check cannot, such
+            # as a differently cased base on Windows
             try:
-                rel_path = path.relative_to(self.base_directory)
-                path_str = str(rel_path)
-                if path_str not in seen_paths:
-                    relative_paths.append(rel_path)
-                    seen_paths.add(path_str)
+                unique_parts[path.relative_to(self.base_directory).parts] = None
             except ValueError:
                 logger.warning(f"Could not make path relative: {path}")
-                continue
 
-        if not relative_paths:
+        if not unique_parts:
             return ""
 
+        relative_paths = sorted(
+            unique_parts, key=lambda parts: os.sep.join(parts).lower()
+        )
+
         # Build directory structure
         structure = self._build_directory_structure(relative_paths)
 
@@ -59,72 +70,83 @@ class ProjectTreeGenerator:
 
         return "\n".join(tree_lines)
 
-    def _build_directory_structure(self, relative_paths: List[Path]) -> Dict:
-        """Build nested dictionary representing directory structure.
+    def _build_directory_structure(
+        self, relative_paths: Iterable[Tuple[str, ...]]
+    ) -> _TreeNode:
+        """Build the nested directory structure of the given files.
 
         Args:
-            relative_paths: List of relative Path objects
+            relative_paths: Path parts of each file, relative to the base
 
         Returns:
-            Nested dictionary with directory structure
+            Root node; each node holds its subdirectories by name and a list
+            of its file names
         """
-        structure: Dict = {}
+        structure: _TreeNode = ({}, [])
 
-        for path in relative_paths:
-            current = structure
-            parts = path.parts
+        for parts in relative_paths:
+            if not parts:
+                continue
+            subdirs, files = structure
 
-            # Build nested structure
-            for i, part in enumerate(parts):
-                is_last = i == len(parts) - 1
+            # Walk into (creating as needed) each parent directory
+            for part in parts[:-1]:
+                node = subdirs.get(part)
+                if node is None:
+                    node = subdirs[part] = ({}, [])
+                subdirs, files = node
 
-                if is_last:
-                    current[part] = None  # Files are leaf nodes
-                else:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
+            files.append(parts[-1])
 
         return structure
 
-    def _render_ascii_tree(
-        self, structure: Dict, prefix: str = "", is_last: bool = True
-    ) -> List[str]:
-        """Recursively render ASCII tree lines.
+    def _render_ascii_tree(self, structure: _TreeNode, prefix: str = "") -> List[str]:
+        """Render ASCII tree lines, depth first, without recursion.
 
         Args:
-            structure: Nested dictionary of directory structure
-            prefix: Current line prefix for proper indentation
-            is_last: Whether current item is last in its group
+            structure: Root node from _build_directory_structure
+            prefix: Line prefix for the top level entries
 
         Returns:
             List of formatted tree lines
         """
-        lines: list[str] = []
-
-        if not structure:
-            return lines
-
-        # Sort items - directories (dict values) first, then files (None values)
-        items = sorted(structure.items(), key=lambda x: (x[1] is None, x[0].lower()))
+        lines: List[str] = []
+
+        # (remaining entries of a directory, index of its last entry, line
+        # prefix); the top of the stack is the directory being listed
+        entries = _sorted_entries(structure)
+        stack: List[
+            Tuple[Iterator[Tuple[int, Tuple[str, Optional[_TreeNode]]]], int, str]
+        ] = [(enumerate(entries), len(entries) - 1, prefix)]
+        while stack:
+            items, last_index, item_prefix = stack[-1]
+            for i, (name, subtree) in items:
+                # Add connector and item name
+                if i == last_index:
+                    connector = "└── "
+                    child_prefix = item_prefix + "    "
+                else:
+                    connector = "├── "
+                    child_prefix = item_prefix + "│   "
 
-        for i, (name, subtree) in enumerate(items):
-            is_last_item = i == len(items) - 1
+                lines.append(f"{item_prefix}{connector}{name}")
 
-            # Add connector and item name
-            if is_last_item:
-                connector = "└── "
-                child_prefix = prefix + "    "
+                # List the subdirectory before the rest of this directory
+                if subtree:
+                    entries = _sorted_entries(subtree)
+                    stack.append((enumerate(entries), len(entries) - 1, child_prefix))
+                    break
             else:
-                connector = "├── "
-                child_prefix = prefix + "│   "
+                stack.pop()
 
-            lines.append(f"{prefix}{connector}{name}")
+        return lines
 
-            # Recursively process subdirectories
-            if isinstance(subtree, dict):
-                lines.extend(
-                    self._render_ascii_tree(subtree, child_prefix, is_last_item)
-                )
 
-        return lines
+def _sorted_entries(node: _TreeNode) -> List[Tuple[str, Optional[_TreeNode]]]:
+    """Order one directory's entries: directories first, then files, by name."""
+    subdirs, files = node
+    entries: List[Tuple[str, Optional[_TreeNode]]] = sorted(
+        subdirs.items(), key=lambda x: x[0].lower()
+    )
+    entries.extend((name, None) for name in sorted(files, key=str.lower))
+    return entries
@@ -1,9 +1,24 @@
 """File utility functions for the Source Stitcher application."""
 
+import configparser
+import functools
 import logging
-import subprocess
+import os
+import re
+import stat
+import weakref
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 import pathspec
 
 logger = logging.getLogger(__name__)
@@ -12,15 +27,28 @@ logger = logging.getLogger(__name__)
 _logged_config: bool = False
 
 
+def _file_mtime_ns(path: Path) -> Optional[int]:
+    """Return the mtime of a regular file in nanoseconds, or None if it is absent."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns if stat.S_ISREG(st.st_mode) else None
+
+
 def load_ignore_patterns(
     directory: Path,
     use_gitignore: bool = True,
     use_npmignore: bool = False,
     use_dockerignore: bool = False,
 ) -> pathspec.PathSpec | None:
-    """Loads ignore patterns from specified ignore files in the directory."""
-    logger.debug(f"Loading ignore patterns from: {directory}")
-    patterns = []
+    """
+    Loads ignore patterns from specified ignore files in the directory.
+
+    Compiled specs are cached (for the 128 most recently used directories)
+    and reused until one of the underlying ignore files is created,
+    modified or removed.
+    """
     ignore_files = []
 
     # Only add files that are enabled
@@ -31,50 +59,247 @@ def load_ignore_patterns(
     if use_dockerignore:
         ignore_files.append(".dockerignore")
 
-    for ig_file in ignore_files:
-        ignore_path = directory / ig_file
-        if ignore_path.is_file():
-            try:
-                with ignore_path.open("r", encoding="utf-8", errors="ignore") as f:
-                    patterns.extend(f.readlines())
-            except Exception as e:
-                logger.warning(f"Could not read {ignore_path}: {e}")
-
-    git_dir = directory / ".git"
-    if git_dir.is_dir():
-        exclude_path = git_dir / "info" / "exclude"
-        if exclude_path.is_file():
-            try:
-                with exclude_path.open("r", encoding="utf-8", errors="ignore") as f:
-                    patterns.extend(f.readlines())
-            except Exception as e:
-                logger.warning(f"Could not read {exclude_path}: {e}")
+    ignore_paths = [directory / ig_file for ig_file in ignore_files]
+    ignore_paths.append(directory / ".git" / "info" / "exclude")
+    # The mtimes are part of the cache key, so edits invalidate the entry
+    signature = tuple(
+        (path, mtime)
+        for path in ignore_paths
+        if (mtime := _file_mtime_ns(path)) is not None
+    )
+    return _cached_ignore_spec(directory, signature)
 
+
+@functools.lru_cache(maxsize=128)
+def _cached_ignore_spec(
+    directory: Path, signature: Tuple[Tuple[Path, int], ...]
+) -> pathspec.PathSpec | None:
+    """Read and parse the existing ignore files listed in the signature."""
+    logger.debug(f"Loading ignore patterns from: {directory}")
+    patterns = []
+    for ignore_path, _ in signature:
+        try:
+            with ignore_path.open("r", encoding="utf-8", errors="ignore") as f:
+                patterns.extend(f.readlines())
+        except Exception as e:
+            logger.warning(f"Could not read {ignore_path}: {e}")
+
+    spec: pathspec.PathSpec | None = None
     if patterns:
         try:
-            return pathspec.PathSpec.from_lines(
+            spec = pathspec.PathSpec.from_lines(
                 pathspec.patterns.GitWildMatchPattern, patterns
             )
         except Exception as e:
             logger.error(f"Error parsing ignore patterns from {directory}: {e}")
+    return spec
+
+
+def ignore_key(relative_path: Union[Path, str], is_dir: bool) -> str:
+    """
+    Build the path string used for ignore matching.
+
+    Directories get a trailing "/" so directory-only patterns such as
+    "__pycache__/" match them; without it pathspec silently misses.
+    """
+    key = str(relative_path)
+    if is_dir and not key.endswith("/"):
+        key += "/"
+    return key
+
+
+_NAMED_GROUP_RE = re.compile(r"\(\?P<[^>]+>")
+
+# id(spec) -> compiled matcher; entries are dropped when the spec is collected
+_matcher_cache: Dict[int, Callable[[str], bool]] = {}
+_merged_spec_cache: Dict[Tuple[int, ...], pathspec.PathSpec | None] = {}
+
+
+def build_ignore_matcher(
+    spec: pathspec.PathSpec | None,
+) -> Callable[[str], bool] | None:
+    """
+    Compile a PathSpec into a single combined regex match function.
+
+    PathSpec.match_file tries every pattern in turn and the last matching
+    pattern decides. Here the patterns are joined into one alternation in
+    reverse order, so the first alternative that matches is that same last
+    pattern and its include/exclude polarity gives the result. Falls back
+    to spec.match_file if the patterns cannot be combined.
+
+    Matchers are memoized per spec object for as long as the spec is alive,
+    so the specs cached by load_ignore_patterns are compiled only once.
+    """
+    if spec is None:
+        return None
+
+    key = id(spec)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = _compile_ignore_matcher(spec)
+        if matcher is None:
+            # Not cached: the bound method would keep the spec alive forever
+            return spec.match_file
+        _matcher_cache[key] = matcher
+        weakref.finalize(spec, _matcher_cache.pop, key, None)
+    return matcher
+
+
+def merge_ignore_specs(
+    specs: List[pathspec.PathSpec],
+) -> pathspec.PathSpec | None:
+    """
+    Merge ignore specs that are checked one after another into one spec.
+
+    A path is ignored when any of the specs ignores it. Joining the pattern
+    lists gives the same answer only when no spec has negated ("!")
+    patterns, since a negation would then also re-include paths ignored by
+    the other specs; None is returned in that case so the caller keeps
+    matching the specs separately.
+
+    Results are memoized per combination of spec objects for as long as
+    they are all alive, so build_ignore_matcher sees the same merged spec
+    on every walk and compiles it only once.
+    """
+    if len(specs) == 1:
+        return specs[0]
+    key = tuple(map(id, specs))
+    if key in _merged_spec_cache:
+        return _merged_spec_cache[key]
+    patterns = [pattern for spec in specs for pattern in spec.patterns]
+    merged = (
+        None
+        if any(pattern.include is False for pattern in patterns)
+        else pathspec.PathSpec(patterns)
+    )
+    _merged_spec_cache[key] = merged
+    for spec in specs:
+        weakref.finalize(spec, _merged_spec_cache.pop, key, None)
+    return merged
+
+
+def _compile_ignore_matcher(
+    spec: pathspec.PathSpec,
+) -> Callable[[str], bool] | None:
+    """Build the combined matcher, or return None if it cannot be built."""
+    alternatives: List[str] = []
+    includes: Dict[str, bool] = {}
+    for pattern in reversed(list(spec.patterns)):
+        if pattern.include is None:
+            continue
+        regex = getattr(pattern, "regex", None)
+        if not isinstance(regex, re.Pattern) or not isinstance(regex.pattern, str):
+            return None
+        if regex.flags & ~re.UNICODE:
             return None
-    return None
+        # Per-pattern named groups would clash once joined; they are not needed
+        group = f"p{len(alternatives)}"
+        alternatives.append(
+            f"(?P<{group}>{_NAMED_GROUP_RE.sub('(?:', regex.pattern)})"
+        )
+        includes[group] = bool(pattern.include)
+
+    if not alternatives:
+        return lambda path: False
+
+    try:
+        combined = re.compile("|".join(alternatives))
+    except re.error as e:
+        logger.debug(f"Could not combine ignore patterns, using PathSpec: {e}")
+        return None
+
+    def match(path: str) -> bool:
+        m = combined.match(pathspec.util.normalize_file(path))
+        return m is not None and m.lastgroup is not None and includes[m.lastgroup]
+
+    return match
+
+
+# Nested [include] files followed at most, the same limit git uses
+_GIT_CONFIG_MAX_INCLUDE_DEPTH = 10
+
+
+def _git_config_paths() -> List[Path]:
+    """Return system and global git config files, lowest precedence first."""
+    global_config = os.environ.get("GIT_CONFIG_GLOBAL")
+    if global_config:
+        return [Path("/etc/gitconfig"), Path(global_config).expanduser()]
+
+    xdg_config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser(
+        "~/.config"
+    )
+    return [
+        Path("/etc/gitconfig"),
+        Path(xdg_config_home) / "git" / "config",
+        Path.home() / ".gitconfig",
+    ]
+
+
+def _read_excludes_file_setting(config_path: Path, depth: int = 0) -> Optional[str]:
+    """
+    Return core.excludesFile as set by one git config file, or None.
 
+    Files named by [include] path entries are read after the file and take
+    precedence over it; [includeIf] sections are conditional and ignored.
+    Parse errors are logged and whatever was parsed is still used.
+    """
+    parser = configparser.ConfigParser(
+        allow_no_value=True,
+        inline_comment_prefixes=("#", ";"),
+        strict=False,
+        interpolation=None,
+    )
+    try:
+        parser.read(config_path, encoding="utf-8")
+    except (configparser.Error, OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Could not parse git config {config_path}: {e}")
 
+    # configparser lowercases option names, matching git's case-insensitive keys
+    try:
+        value = parser.get("core", "excludesfile", fallback=None)
+        include = parser.get("include", "path", fallback=None)
+    except configparser.Error as e:
+        logger.warning(f"Could not read git config {config_path}: {e}")
+        return None
+
+    if include and depth < _GIT_CONFIG_MAX_INCLUDE_DEPTH:
+        include_path = Path(include.strip().strip('"')).expanduser()
+        if not include_path.is_absolute():
+            include_path = config_path.parent / include_path
+        value = _read_excludes_file_setting(include_path, depth + 1) or value
+    return value
+
+
+def _get_global_excludes_file() -> Optional[str]:
+    """Read core.excludesFile from the git config files without spawning git."""
+    value: Optional[str] = None
+    for config_path in _git_config_paths():
+        value = _read_excludes_file_setting(config_path) or value
+    if not value:
+        return None
+    return value.strip().strip('"')
+
+
+@functools.cache
 def load_global_gitignore() -> pathspec.PathSpec | None:
-    """Load global gitignore patterns."""
+    """
+    Load global gitignore patterns.
+
+    The result is cached for the life of the process; call
+    clear_global_gitignore_cache() to pick up changes to the git config or
+    the excludes file.
+    """
     logger.debug("Loading global gitignore patterns")
     global_patterns = []
     try:
-        global_ignore = (
-            subprocess.check_output(["git", "config", "--get", "core.excludesFile"])
-            .decode()
-            .strip()
-        )
-        global_path = Path(global_ignore).expanduser()
-        if global_path.is_file():
-            with global_path.open("r", encoding="utf-8", errors="ignore") as f:
-                global_patterns = f.readlines()
+        global_ignore = _get_global_excludes_file()
+        if global_ignore is None:
+            logger.debug("No core.excludesFile configured in git config")
+        else:
+            global_path = Path(global_ignore).expanduser()
+            if global_path.is_file():
+                with global_path.open("r", encoding="utf-8", errors="ignore") as f:
+                    global_patterns = f.readlines()
     except Exception as e:
         logger.warning(f"Could not load global gitignore: {e}")
 
@@ -87,13 +312,55 @@ def load_global_gitignore() -> pathspec.PathSpec | None:
     )
 
 
+def clear_global_gitignore_cache() -> None:
+    """Forget the cached result of load_global_gitignore()."""
+    load_global_gitignore.cache_clear()
+
+
+def dir_mode_allows_listing(st: os.stat_result) -> bool:
+    """Check read and search permission on a directory from its stat result.
+
+    This mirrors ``os.access(path, os.R_OK | os.X_OK)`` using the mode bits
+    that ``os.scandir`` entries already carry, without another syscall per
+    entry. ACLs are not considered; anything they deny surfaces later as a
+    PermissionError when the directory is actually listed.
+    """
+    if not hasattr(os, "geteuid"):
+        return True
+    euid = os.geteuid()
+    if euid == 0:
+        return True
+    if st.st_uid == euid:
+        need = stat.S_IRUSR | stat.S_IXUSR
+    elif st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+        need = stat.S_IRGRP | stat.S_IXGRP
+    else:
+        need = stat.S_IROTH | stat.S_IXOTH
+    return st.st_mode & need == need
+
+
+# Leading bytes checked for NUL when deciding whether a file is binary
+BINARY_SNIFF_SIZE = 1024
+
+# O_BINARY only exists (and matters) on Windows
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def is_binary_bytes(head: bytes) -> bool:
+    """Check the leading bytes of a file for NUL, as is_binary_file does."""
+    return b"\0" in head[:BINARY_SNIFF_SIZE]
+
+
 def is_binary_file(filepath: Path) -> bool:
     """Check if a file is likely binary by looking for null bytes."""
-    logger.debug(f"Checking if file is binary: {filepath}")
-    CHUNK_SIZE = 1024
+    logger.debug("Checking if file is binary: %s", filepath)
     try:
-        with filepath.open("rb") as f:
-            chunk = f.read(CHUNK_SIZE)
+        # A raw fd read; no file object is needed for a single small read
+        fd = os.open(filepath, _O_RDONLY_BINARY)
+        try:
+            chunk = os.read(fd, BINARY_SNIFF_SIZE)
+        finally:
+            os.close(fd)
         return b"\0" in chunk
     except OSError as e:
         logger.warning(
@@ -108,16 +375,9 @@ def is_binary_file(filepath: Path) -> bool:
         return True
 
 
-def is_likely_text_file(filepath: Path) -> bool:
-    """
-    Detect if file is likely text based on name patterns and content.
-
-    Uses three-tier matching:
-    1. Exact filename matches (e.g., "readme", "dockerfile")
-    2. Prefix patterns (e.g., "dockerfile*" matches "Dockerfile.sandbox")
-    3. Suffix patterns (e.g., ".env" matches ".env.example")
-    """
-    KNOWN_BINARY_DOTFILE_EXTENSIONS = {
+# Name patterns used by is_likely_text_file
+_KNOWN_BINARY_DOTFILE_EXTENSIONS = frozenset(
+    {
         ".pyc",
         ".pyo",
         ".pyd",
@@ -126,8 +386,10 @@ def is_likely_text_file(filepath: Path) -> bool:
         ".dll",
         ".class",
     }
+)
 
-    KNOWN_TEXT_EXTENSIONS = {
+_KNOWN_TEXT_EXTENSIONS = frozenset(
+    {
         ".ini",
         ".cfg",
         ".conf",
@@ -167,8 +429,10 @@ def is_likely_text_file(filepath: Path) -> bool:
         ".hbs",
         ".handlebars",
     }
+)
 
-    TEXT_FILENAME_EXACT = {
+_TEXT_FILENAME_EXACT = frozenset(
+    {
         "readme",
         "license",
         "licence",
@@ -194,44 +458,61 @@ def is_likely_text_file(filepath: Path) -> bool:
         "manifest",
         "copyright",
     }
+)
 
-    TEXT_FILENAME_PREFIXES = (
-        "dockerfile",
-        "makefile",
-        "rakefile",
-        "gemfile",
-        "pipfile",
-        "procfile",
-        "vagrantfile",
-        "jenkinsfile",
-    )
+_TEXT_FILENAME_PREFIXES = (
+    "dockerfile",
+    "makefile",
+    "rakefile",
+    "gemfile",
+    "pipfile",
+    "procfile",
+    "vagrantfile",
+    "jenkinsfile",
+)
+
+_TEXT_FILENAME_PREFIXES_ENV = (
+    ".env",
+    ".envrc",
+)
 
-    TEXT_FILENAME_PREFIXES_ENV = (
-        ".env",
-        ".envrc",
+
+def is_likely_text_file(filepath: Path) -> bool:
+    """
+    Detect if file is likely text based on name patterns and content.
+
+    Uses three-tier matching:
+    1. Exact filename matches (e.g., "readme", "dockerfile")
+    2. Prefix patterns (e.g., "dockerfile*" matches "Dockerfile.sandbox")
+    3. Suffix patterns (e.g., ".env" matches ".env.example")
+    """
+    return _is_likely_text_file(
+        filepath, filepath.name.lower(), filepath.suffix.lower()
     )
 
-    name = filepath.name.lower()
-    file_exists = filepath.exists()
 
-    if name in TEXT_FILENAME_EXACT:
-        return not is_binary_file(filepath) if file_exists else True
+def _is_likely_text_file(filepath: Path, name: str, suffix: str) -> bool:
+    """is_likely_text_file with the lowercased name and suffix already computed."""
+    # Only these name matches treat a missing file as text; the stat for it
+    # is made here rather than up front for every file
+    if name in _TEXT_FILENAME_EXACT:
+        return not is_binary_file(filepath) if filepath.exists() else True
 
-    if name.startswith(TEXT_FILENAME_PREFIXES):
-        return not is_binary_file(filepath) if file_exists else True
+    if name.startswith(_TEXT_FILENAME_PREFIXES):
+        return not is_binary_file(filepath) if filepath.exists() else True
 
-    if name.startswith(TEXT_FILENAME_PREFIXES_ENV):
-        return not is_binary_file(filepath) if file_exists else True
+    if name.startswith(_TEXT_FILENAME_PREFIXES_ENV):
+        return not is_binary_file(filepath) if filepath.exists() else True
 
     if name.startswith("."):
-        if filepath.suffix.lower() in KNOWN_BINARY_DOTFILE_EXTENSIONS:
+        if suffix in _KNOWN_BINARY_DOTFILE_EXTENSIONS:
             return False
         return not is_binary_file(filepath)
 
-    if not filepath.suffix:
+    if not suffix:
         return not is_binary_file(filepath)
 
-    if filepath.suffix.lower() in KNOWN_TEXT_EXTENSIONS:
+    if suffix in _KNOWN_TEXT_EXTENSIONS:
         return not is_binary_file(filepath)
 
     return False
@@ -239,73 +520,148 @@ def is_likely_text_file(filepath: Path) -> bool:
 
 def build_filter_sets(ext_dict: Dict[str, List[str]]) -> Tuple[Set[str], Set[str]]:
     """Compiles all known extensions and filenames into sets for quick lookup."""
-    by_ext: Set[str] = set()
-    by_name: Set[str] = set()
-    for exts in ext_dict.values():
-        for e in exts:
-            (by_ext if e.startswith(".") else by_name).add(e.lower())
-    return by_ext, by_name
+    all_items = {e.lower() for exts in ext_dict.values() for e in exts}
+    by_ext = {e for e in all_items if e[:1] == "."}
+    return by_ext, all_items - by_ext
+
+
+def split_suffix(name: str) -> str:
+    """Return the suffix of a file name using the same rules as PurePath.suffix."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ""
 
 
 def matches_file_type(
     filepath: Path,
-    selected_exts: Set[str],
-    selected_names: Set[str],
-    all_exts: Set[str],
-    all_names: Set[str],
+    selected_exts: AbstractSet[str],
+    selected_names: AbstractSet[str],
+    all_exts: AbstractSet[str],
+    all_names: AbstractSet[str],
     handle_other: bool,
 ) -> bool:
     """Check if a file path matches the compiled filter sets."""
-    file_ext = filepath.suffix.lower()
-    file_name = filepath.name.lower()
+    return _matches_file_type(
+        filepath,
+        filepath.name.lower(),
+        filepath.suffix.lower(),
+        selected_exts,
+        selected_names,
+        all_exts,
+        all_names,
+        handle_other,
+    )
 
-    FILENAME_PREFIXES = (
-        "dockerfile",
-        "makefile",
-        "rakefile",
-        "gemfile",
-        "pipfile",
-        "procfile",
-        "vagrantfile",
-        "jenkinsfile",
+
+def matches_dirent(
+    entry: os.DirEntry,
+    selected_exts: AbstractSet[str],
+    selected_names: AbstractSet[str],
+    all_exts: AbstractSet[str],
+    all_names: AbstractSet[str],
+    handle_other: bool,
+) -> bool:
+    """
+    Check if a directory entry matches the compiled filter sets.
+
+    Works from the entry's name string; a Path is only built if the content
+    has to be sniffed for the "other text files" check.
+    """
+    file_name = entry.name.lower()
+    return _matches_file_type(
+        entry.path,
+        file_name,
+        split_suffix(file_name),
+        selected_exts,
+        selected_names,
+        all_exts,
+        all_names,
+        handle_other,
+    )
+
+
+def matches_file_name(
+    path: Union[Path, str],
+    file_name: str,
+    selected_exts: AbstractSet[str],
+    selected_names: AbstractSet[str],
+    all_exts: AbstractSet[str],
+    all_names: AbstractSet[str],
+    handle_other: bool,
+) -> bool:
+    """
+    Check a file, given its lowercased name, against the compiled filter sets.
+
+    Like matches_dirent, a Path is only built from path if the content has
+    to be sniffed for the "other text files" check.
+    """
+    return _matches_file_type(
+        path,
+        file_name,
+        split_suffix(file_name),
+        selected_exts,
+        selected_names,
+        all_exts,
+        all_names,
+        handle_other,
     )
 
+
+def _matches_file_type(
+    path: Union[Path, str],
+    file_name: str,
+    file_ext: str,
+    selected_exts: AbstractSet[str],
+    selected_names: AbstractSet[str],
+    all_exts: AbstractSet[str],
+    all_names: AbstractSet[str],
+    handle_other: bool,
+) -> bool:
+    """matches_file_type with the lowercased name and suffix already computed."""
+    # Reasons are only put together when they will actually be logged
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     # Only log the full configuration once
     global _logged_config
-    if not _logged_config:
+    if debug and not _logged_config:
         logger.debug("File type matching configuration:")
         logger.debug(f"  - Selected extensions: {selected_exts}")
         logger.debug(f"  - Selected names: {selected_names}")
         logger.debug(f"  - Handle other files: {handle_other}")
         _logged_config = True
 
-    matches = False
-    reason = ""
-
     if file_name in selected_names:
         matches = True
-        reason = f"file name matches selected name pattern"
+        reason = "file name matches selected name pattern"
     elif (
-        file_name.startswith(FILENAME_PREFIXES)
+        file_name.startswith(_TEXT_FILENAME_PREFIXES)
         and file_name.removesuffix(file_ext) in selected_names
     ):
         matches = True
-        reason = f"file name prefix matches selected name pattern"
+        reason = "file name prefix matches selected name pattern"
     elif file_ext in selected_exts:
         matches = True
-        reason = f"file extension matches selected patterns"
+        reason = "file extension matches selected patterns"
     elif handle_other and file_name not in all_names and file_ext not in all_exts:
-        is_text = is_likely_text_file(filepath)
-        matches = is_text
-        reason = f"file is {'a text' if is_text else 'not a text'} file (other files handling enabled)"
+        filepath = path if isinstance(path, Path) else Path(path)
+        matches = _is_likely_text_file(filepath, file_name, file_ext)
+        reason = (
+            "file is a text file (other files handling enabled)"
+            if matches
+            else "file is not a text file (other files handling enabled)"
+        )
     else:
+        matches = False
         reason = "no matching criteria met"
-        if not handle_other:
-            reason += " (other files handling is disabled)"
-        if file_name in all_names:
-            reason += " (file name is a known type but not selected)"
-        if file_ext in all_exts:
-            reason += " (file extension is a known type but not selected)"
-
-    logger.debug(f"File: {filepath.name} - {reason} - result: {matches}")
+        if debug:
+            if not handle_other:
+                reason += " (other files handling is disabled)"
+            if file_name in all_names:
+                reason += " (file name is a known type but not selected)"
+            if file_ext in all_exts:
+                reason += " (file extension is a known type but not selected)"
+
+    if debug:
+        logger.debug("File: %s - %s - result: %s", file_name, reason, matches)
     return matches
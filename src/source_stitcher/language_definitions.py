@@ -4,7 +4,9 @@ This module previously hardcoded the language/filename mappings.
 To keep a single source of truth, it now delegates to the TOML-backed loader.
 """
 
-from typing import Dict, List
+from bisect import bisect_left
+from functools import cache
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
 from pathlib import Path
 import logging
 
@@ -13,10 +15,14 @@ from .core.language_loader import LanguageDefinitionLoader
 logger = logging.getLogger(__name__)
 
 
+@cache
 def get_language_extensions(config_path: Path | None = None) -> Dict[str, List[str]]:
     """
     Load language definitions from the TOML configuration via LanguageDefinitionLoader.
 
+    Results are cached per config path, so the TOML file is parsed only once per
+    process. Callers must treat the returned mapping as read-only.
+
     Args:
         config_path: Optional explicit path to language_definitions.toml
 
@@ -25,3 +31,87 @@ def get_language_extensions(config_path: Path | None = None) -> Dict[str, List[s
     """
     loader = LanguageDefinitionLoader(config_path=config_path)
     return loader.load_definitions()
+
+
+class LanguageTables(NamedTuple):
+    """Lookup tables derived once from the language definitions."""
+
+    languages: Dict[str, List[str]]
+    all_extensions: FrozenSet[str]
+    all_filenames: FrozenSet[str]
+    # lowercased language name -> (lowercased extensions, lowercased filenames)
+    lower_name_index: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]
+    # sorted (search key, definition order, lowercased language name); keys are
+    # each full name plus its underscore-separated parts
+    search_keys: List[Tuple[str, int, str]]
+
+
+@cache
+def get_language_tables(config_path: Path | None = None) -> LanguageTables:
+    """
+    Build the CLI lookup tables for the language definitions.
+
+    Extensions and filenames are lowercased here, once, because the walker
+    compares them against lowercased file names and suffixes.
+
+    Args:
+        config_path: Optional explicit path to language_definitions.toml
+
+    Returns:
+        A LanguageTables tuple, cached per config path
+    """
+    languages = get_language_extensions(config_path)
+    lower_name_index: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+    for lang_name, extensions in languages.items():
+        lower_name_index[lang_name.lower()] = (
+            frozenset(ext.lower() for ext in extensions if ext.startswith(".")),
+            frozenset(ext.lower() for ext in extensions if not ext.startswith(".")),
+        )
+    search_keys = sorted(
+        (key, order, lower_name)
+        for order, lower_name in enumerate(lower_name_index)
+        for key in {lower_name, *lower_name.split("_")}
+        if key
+    )
+    return LanguageTables(
+        languages=languages,
+        all_extensions=frozenset().union(*(e for e, _ in lower_name_index.values())),
+        all_filenames=frozenset().union(*(n for _, n in lower_name_index.values())),
+        lower_name_index=lower_name_index,
+        search_keys=search_keys,
+    )
+
+
+def find_language(
+    tables: LanguageTables, type_name: str
+) -> Tuple[FrozenSet[str], FrozenSet[str]] | None:
+    """
+    Look up the (extensions, filenames) of a language by a user-supplied name.
+
+    Matching is case-insensitive and by exact name or prefix, where a language
+    can be named in full ("c_cpp") or by any underscore-separated part of
+    its name ("cpp"). An exact match wins over a prefix match; ties go to the
+    language defined first.
+
+    Args:
+        tables: Tables from get_language_tables()
+        type_name: Language name as typed on the command line
+
+    Returns:
+        The language's extension and filename sets, or None if nothing matches
+    """
+    key = type_name.lower()
+    entry = tables.lower_name_index.get(key)
+    if entry is not None:
+        return entry
+
+    search_keys = tables.search_keys
+    best: Tuple[bool, int, str] | None = None
+    i = bisect_left(search_keys, (key,))
+    while i < len(search_keys) and search_keys[i][0].startswith(key):
+        candidate_key, order, lower_name = search_keys[i]
+        rank = (candidate_key != key, order, lower_name)
+        if best is None or rank < best:
+            best = rank
+        i += 1
+    return tables.lower_name_index[best[2]] if best is not None else None
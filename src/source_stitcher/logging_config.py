@@ -2,6 +2,20 @@
 
 import logging
 import sys
+from typing import Optional, Tuple
+
+# Supported --log-level names; logging.getLevelNamesMapping() needs Python 3.11+
+_LEVEL_MAP = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+}
+
+# Arguments and handler from the last configure_logging call, used to skip
+# reconfiguring when called again with identical settings
+_last_config: Optional[Tuple[bool, bool, str, bool]] = None
+_last_handler: Optional[logging.Handler] = None
 
 
 def configure_logging(
@@ -19,26 +33,27 @@ def configure_logging(
         log_level: Specific log level (DEBUG, INFO, WARNING, ERROR)
         is_cli_mode: Whether running in CLI mode (affects output format)
     """
+    global _last_config, _last_handler
+
+    # Configure root logger
+    root_logger = logging.getLogger()
+
+    config = (verbose, quiet, log_level.upper(), is_cli_mode)
+    if config == _last_config and _last_handler in root_logger.handlers:
+        return
+
     # Determine the effective log level
     if quiet:
         level = logging.ERROR
     elif verbose:
         level = logging.DEBUG
     else:
-        level_map = {
-            "DEBUG": logging.DEBUG,
-            "INFO": logging.INFO,
-            "WARNING": logging.WARNING,
-            "ERROR": logging.ERROR,
-        }
-        level = level_map.get(log_level.upper(), logging.INFO)
+        level = _LEVEL_MAP.get(log_level.upper(), logging.INFO)
 
-    # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
     # Clear existing handlers
-    for handler in root_logger.handlers[:]:
+    for handler in list(root_logger.handlers):
         root_logger.removeHandler(handler)
 
     # Create appropriate handler based on mode
@@ -66,6 +81,8 @@ def configure_logging(
     handler.setLevel(level)
     handler.setFormatter(formatter)
     root_logger.addHandler(handler)
+    _last_config = config
+    _last_handler = handler
 
     # Configure specific loggers for better control
     # Reduce noise from Qt and other libraries unless in debug mode
@@ -75,7 +92,7 @@ def configure_logging(
 
     # Log the configuration for debugging
     if level <= logging.DEBUG:
-        logging.debug(
+        root_logger.debug(
             f"Logging configured - Level: {logging.getLevelName(level)}, "
             f"CLI Mode: {is_cli_mode}, Verbose: {verbose}, Quiet: {quiet}"
         )
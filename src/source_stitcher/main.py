@@ -7,13 +7,9 @@ import logging
 import sys
 from pathlib import Path
 
-from PyQt6 import QtCore, QtWidgets
-
 from source_stitcher.config import AppSettings
-from source_stitcher.ui.main_window import FileConcatenator
 from source_stitcher.logging_config import configure_logging
 from source_stitcher.cli.parser import parse_cli_arguments, create_cli_config_from_args
-from source_stitcher.cli.runner import run_cli_mode
 
 # Default logging configuration - will be reconfigured based on CLI args
 logging.basicConfig(
@@ -29,6 +25,10 @@ def main():
     """Main application entry point."""
     logger.debug("Application starting.")
     args = parse_cli_arguments()
+    # Qt and the mode-specific modules are imported only once we know which
+    # mode runs, so --version and --list-types exit without loading them
+    from PyQt6 import QtCore
+
     app_settings = AppSettings()
 
     QtCore.QCoreApplication.setApplicationName(app_settings.window_title)
@@ -37,6 +37,8 @@ def main():
 
     if args and args.cli:
         logger.debug("Running in CLI mode.")
+        from source_stitcher.cli.runner import run_cli_mode
+
         cli_config = create_cli_config_from_args(args)
         configure_logging(
             verbose=cli_config.verbose,
@@ -48,6 +50,10 @@ def main():
         sys.exit(exit_code)
     else:
         logger.debug("Running in GUI mode.")
+        from PyQt6 import QtWidgets
+
+        from source_stitcher.ui.main_window import FileConcatenator
+
         verbose = args.verbose if args else False
         quiet = args.quiet if args else False
         log_level = args.log_level if args else "INFO"
@@ -146,32 +146,42 @@ class SaveFileDialog:
             )
             return
 
-        # The temp file now contains the complete output with header, tree, and content
-        # Just copy it directly to the final location while counting tokens for reporting
-        logger.debug(f"Copying complete temp file to output: {output_filename}")
+        # The temp file already holds the complete output with header, tree, and
+        # content; read it only to count tokens, then rename it into place
         token_count: Optional[int] = None
         try:
-            with atomic_write(
-                output_path, mode="w", encoding="utf-8", overwrite=True
-            ) as final_file:
+            if self.token_encoder:
                 with open(temp_file_path, "r", encoding="utf-8") as temp_file:
                     content = temp_file.read()
-                    final_file.write(content)
-                    if self.token_encoder:
-                        try:
-                            token_count = len(self.token_encoder.encode(content))
-                        except Exception as exc:  # pragma: no cover - rarely triggered
-                            logger.warning("Failed to count tokens: %s", exc)
+                try:
+                    token_count = len(self.token_encoder.encode(content))
+                except Exception as exc:  # pragma: no cover - rarely triggered
+                    logger.warning("Failed to count tokens: %s", exc)
+                del content
+            try:
+                logger.debug(f"Moving temp file into place: {output_filename}")
+                os.replace(temp_file_path, output_path)
+            except OSError as e:
+                # Typically a different filesystem; copy through an atomic write
+                logger.debug(f"Rename failed ({e}), copying temp file instead")
+                with atomic_write(
+                    output_path, mode="w", encoding="utf-8", overwrite=True
+                ) as final_file:
+                    with open(temp_file_path, "r", encoding="utf-8") as temp_file:
+                        shutil.copyfileobj(temp_file, final_file)
         except Exception as e:
             error_msg = f"Error writing output file: {e}"
             logger.error(error_msg, exc_info=True)
             raise IOError(error_msg)
         finally:
-            logger.debug(f"Removing temporary file: {temp_file_path}")
-            try:
-                os.unlink(temp_file_path)
-            except OSError as e:
-                logger.warning(f"Could not remove temporary file {temp_file_path}: {e}")
+            if os.path.exists(temp_file_path):
+                logger.debug(f"Removing temporary file: {temp_file_path}")
+                try:
+                    os.unlink(temp_file_path)
+                except OSError as e:
+                    logger.warning(
+                        f"Could not remove temporary file {temp_file_path}: {e}"
+                    )
 
         logger.info(f"Successfully generated file: {output_filename}")
         success_message = [
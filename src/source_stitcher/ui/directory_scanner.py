@@ -0,0 +1,162 @@
+"""Background directory scanning for the file tree."""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from PyQt6 import QtCore
+
+from source_stitcher.file_utils import (
+    dir_mode_allows_listing,
+    ignore_key,
+    matches_dirent,
+    split_suffix,
+)
+
+logger = logging.getLogger(__name__)
+
+# (path, is_dir) for each entry that survived filtering, in display order
+ScanResult = List[Tuple[Path, bool]]
+
+
+@dataclass
+class ScanRequest:
+    """Snapshot of everything needed to list one directory off the UI thread."""
+
+    directory: Path
+    working_dir: Path
+    root_str: str
+    root_prefix: str
+    ignore_match: Optional[Callable[[str], bool]]
+    include_hidden: bool
+    selected_exts: Set[str]
+    selected_names: Set[str]
+    all_exts: Set[str]
+    all_names: Set[str]
+    handle_other: bool
+
+
+def scan_directory(request: ScanRequest) -> ScanResult:
+    """List one directory level, applying the tree's ignore and type filters.
+
+    The search box is not applied here; matching rows are shown and hidden
+    on the finished tree instead.
+
+    Raises:
+        OSError: If the directory itself cannot be listed.
+    """
+    has_type_filter = bool(
+        request.selected_exts or request.selected_names or request.handle_other
+    )
+    selected_exts = request.selected_exts
+    selected_names = request.selected_names
+    # Ignore keys are built by string concatenation; a Path is only created
+    # for entries that end up in the result
+    try:
+        relative_dir = request.directory.relative_to(request.working_dir)
+        relative_prefix = f"{relative_dir}{os.sep}" if relative_dir.parts else ""
+    except ValueError:
+        relative_prefix = ""
+    # (lowercased name, is_dir, path) for accepted entries
+    entries: List[Tuple[str, bool, str]] = []
+    with os.scandir(request.directory) as it:
+        for entry in it:
+            name = entry.name
+            if name == "node_modules":
+                continue
+            if name.startswith(".") and not request.include_hidden:
+                continue
+            # File type flags come from the directory listing itself; only
+            # symlinks need a stat() to learn what they point at
+            try:
+                is_symlink = entry.is_symlink()
+                is_dir_nolink = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            try:
+                # Only symlinks can point outside the tree; plain entries
+                # share the (already validated) directory's prefix
+                resolved_str = (
+                    os.path.realpath(entry.path) if is_symlink else entry.path
+                )
+                if resolved_str != request.root_str and not resolved_str.startswith(
+                    request.root_prefix
+                ):
+                    logger.warning(
+                        f"Rejected path outside project root: {resolved_str}"
+                    )
+                    continue
+            except Exception as e:
+                logger.warning(f"Error resolving path {entry.path}: {e}")
+                continue
+            if request.ignore_match and request.ignore_match(
+                ignore_key(relative_prefix + name, is_dir_nolink)
+            ):
+                continue
+            name_lower = name.lower()
+            # Unreadable files are reported when they are read; only
+            # directories we cannot list are hidden up front
+            try:
+                is_dir = entry.is_dir() if is_symlink else is_dir_nolink
+                if is_dir:
+                    if not dir_mode_allows_listing(entry.stat()):
+                        continue
+                elif not entry.is_file():
+                    continue
+                elif has_type_filter:
+                    # Plain name/extension hits are settled here; prefixed
+                    # names and "other" files need the full check
+                    if (
+                        name_lower not in selected_names
+                        and split_suffix(name_lower) not in selected_exts
+                        and not matches_dirent(
+                            entry,
+                            selected_exts,
+                            selected_names,
+                            request.all_exts,
+                            request.all_names,
+                            request.handle_other,
+                        )
+                    ):
+                        continue
+            except OSError:
+                continue
+            entries.append((name_lower, is_dir, entry.path))
+
+    entries.sort(key=lambda x: (not x[1], x[0]))
+    return [(Path(path), is_dir) for _, is_dir, path in entries]
+
+
+class ScanSignals(QtCore.QObject):
+    """Signals for ScanRunnable, which cannot emit them itself."""
+
+    # generation, scan id, ScanResult, error message
+    finished = QtCore.pyqtSignal(int, int, list, str)
+
+
+class ScanRunnable(QtCore.QRunnable):
+    """Runs scan_directory on a QThreadPool thread and reports the result."""
+
+    def __init__(self, generation: int, scan_id: int, request: ScanRequest) -> None:
+        super().__init__()
+        self.generation = generation
+        self.scan_id = scan_id
+        self.request = request
+        self.signals = ScanSignals()
+
+    def run(self) -> None:
+        """Scan the directory and emit the entries or an error message."""
+        directory = self.request.directory
+        results: ScanResult = []
+        error = ""
+        try:
+            results = scan_directory(self.request)
+        except PermissionError as e:
+            logger.error(f"Permission denied accessing directory: {directory}. {e}")
+            error = str(e) or "Permission denied"
+        except Exception as e:
+            logger.error(f"Error listing directory {directory}: {e}", exc_info=True)
+            error = str(e) or type(e).__name__
+        self.signals.finished.emit(self.generation, self.scan_id, results, error)
@@ -2,9 +2,12 @@
 
 import logging
 import os
+import re
 import stat
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, List, Optional, Set, Tuple, Dict
+from typing import Any, Callable, Deque, FrozenSet, List, Optional, Set, Tuple, Dict
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 import tiktoken
@@ -18,18 +21,96 @@ from source_stitcher.config import (
     DEFAULT_TOKEN_BUDGET,
 )
 from source_stitcher.file_utils import (
-    build_filter_sets,
+    build_ignore_matcher,
+    ignore_key,
     is_binary_file,
     load_ignore_patterns,
     load_global_gitignore,
     matches_file_type,
 )
 from source_stitcher.core.language_loader import LanguageDefinitionLoader
+from source_stitcher.ui.directory_scanner import ScanRequest, ScanRunnable
 from source_stitcher.ui.dialogs import SaveFileDialog
-from source_stitcher.worker import GeneratorWorker
+from source_stitcher.worker import GeneratorSignals, GeneratorTask
 
 logger = logging.getLogger(__name__)
 
+# Bound once so the check-state loops skip the enum attribute chains
+_CHECKED = QtCore.Qt.CheckState.Checked
+_UNCHECKED = QtCore.Qt.CheckState.Unchecked
+_PARTIAL = QtCore.Qt.CheckState.PartiallyChecked
+_USER_CHECKABLE = QtCore.Qt.ItemFlag.ItemIsUserCheckable
+
+# Selections larger than this resolve their paths on a thread pool
+_PARALLEL_RESOLVE_THRESHOLD = 64
+
+# Shared by every selection scan (one per token estimate), created on first use
+_resolve_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_resolve_executor() -> ThreadPoolExecutor:
+    """Return the thread pool used to resolve large selections."""
+    global _resolve_executor
+    if _resolve_executor is None:
+        _resolve_executor = ThreadPoolExecutor(
+            max_workers=min(32, os.cpu_count() or 1),
+            thread_name_prefix="resolve",
+        )
+    return _resolve_executor
+
+
+def _start_in_thread_pool(runnable: QtCore.QRunnable) -> None:
+    """Start a runnable on Qt's global thread pool, or inline if there is none."""
+    pool = QtCore.QThreadPool.globalInstance()
+    if pool is None:
+        logger.warning("No global thread pool; running task on the GUI thread")
+        runnable.run()
+        return
+    pool.start(runnable)
+
+
+def _resolve_or_none(path: Path) -> Optional[str]:
+    """Resolve a path to a string, logging and returning None on failure."""
+    try:
+        return str(path.resolve())
+    except Exception as e:
+        logger.warning(f"Error resolving path {path}: {e}")
+        return None
+
+
+class FileIconDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Item delegate that resolves file icons when a row is first painted.
+
+    File nodes are created without an icon; rows that are filtered out or
+    never scrolled into view never pay for the icon provider lookup.
+    """
+
+    def __init__(
+        self,
+        icon_for_path: Callable[[Path], QtGui.QIcon],
+        path_role: int,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._icon_for_path = icon_for_path
+        self._path_role = path_role
+
+    def initStyleOption(
+        self,
+        option: Optional[QtWidgets.QStyleOptionViewItem],
+        index: QtCore.QModelIndex,
+    ) -> None:
+        super().initStyleOption(option, index)
+        if option is None or not option.icon.isNull():
+            return
+        path = index.data(self._path_role)
+        if isinstance(path, Path):
+            option.icon = self._icon_for_path(path)
+            option.features |= (
+                QtWidgets.QStyleOptionViewItem.ViewItemFeature.HasDecoration
+            )
+
 
 class FileConcatenator(QtWidgets.QMainWindow):
     """
@@ -38,6 +119,8 @@ class FileConcatenator(QtWidgets.QMainWindow):
 
     PATH_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
     LANGUAGE_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+    # (checkable children, checked children, partially checked children)
+    COUNTS_ROLE = QtCore.Qt.ItemDataRole.UserRole + 3
 
     def __init__(self, working_dir: Optional[Path] = None) -> None:
         super().__init__()
@@ -45,6 +128,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self.app_settings = AppSettings()
         self.initial_base_dir = (working_dir or Path.cwd()).resolve()
         self.working_dir = self.initial_base_dir
+        self._update_working_root()
         self.setWindowTitle(
             f"{self.app_settings.window_title} v{self.app_settings.application_version} - [{self.working_dir.name}]"
         )
@@ -54,19 +138,54 @@ class FileConcatenator(QtWidgets.QMainWindow):
         )
 
         self.ignore_spec = load_ignore_patterns(self.working_dir)
+        self._ignore_match = build_ignore_matcher(self.ignore_spec)
         self.global_ignore_spec = load_global_gitignore()
         self.icon_provider = QtWidgets.QFileIconProvider()
+        # File icons keyed by lowercased suffix (or name for extensionless files)
+        self._icon_cache: Dict[str, QtGui.QIcon] = {}
+
+        # Directory scans run on the thread pool; a new generation starts
+        # whenever the tree is rebuilt so late results can be discarded
+        self._scan_generation = 0
+        self._next_scan_id = 0
+        self._pending_scans: Dict[int, Optional[QtWidgets.QTreeWidgetItem]] = {}
 
-        self.worker_thread: Optional[QtCore.QThread] = None
-        self.worker: Optional[GeneratorWorker] = None
+        self.worker: Optional[GeneratorTask] = None
+        self._pending_progress: Optional[int] = None
         self.is_generating = False
+        # Shared by every GeneratorTask, so the slots are connected only once
+        self.generator_signals = GeneratorSignals()
+        signals = self.generator_signals
+        signals.discovery_progress.connect(self.handle_discovery_progress)
+        signals.pre_count_finished.connect(self.handle_pre_count)
+        # Always queued, so progress is coalesced on the GUI thread whichever
+        # thread the task emits from; the PyQt6 stubs omit connect's type arg
+        signals.progress_updated.connect(  # type: ignore[call-arg]
+            self.handle_progress_update,
+            type=QtCore.Qt.ConnectionType.QueuedConnection,
+        )
+        signals.status_updated.connect(self.handle_status_update)
+        # Slots run in connection order: handle the result, then reset the UI
+        signals.finished.connect(self.handle_generation_finished)
+        signals.finished.connect(self.generation_cleanup)
 
         # Initialize language definition loader
         self.language_loader = LanguageDefinitionLoader()
         self.language_extensions = self.language_loader.load_definitions()
-        self.ALL_EXTENSIONS, self.ALL_FILENAMES = build_filter_sets(
-            self.language_extensions
+        self.OTHER_LANGUAGES = self.language_loader.get_other_languages()
+        # Per-language lowercased (extensions, filenames), split by the loader
+        self._lang_ext_sets: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = (
+            self.language_loader.get_normalized_definitions()
+        )
+        self.ALL_EXTENSIONS: Set[str] = set().union(
+            *(exts for exts, _ in self._lang_ext_sets.values())
+        )
+        self.ALL_FILENAMES: Set[str] = set().union(
+            *(names for _, names in self._lang_ext_sets.values())
         )
+        self._filter_sets_cache: Optional[
+            Tuple[int, Tuple[Set[str], Set[str], bool]]
+        ] = None
         self.save_dialog = SaveFileDialog(self)
 
         # Initialize token estimation
@@ -75,6 +194,13 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self._debounce_timer.setSingleShot(True)
         self._debounce_timer.timeout.connect(self._update_token_estimate)
 
+        # Debounce search input so a burst of keystrokes triggers one refresh
+        self._last_search = ""
+        self._search_timer = QtCore.QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search_filter)
+
         try:
             self.token_encoder: Any = tiktoken.get_encoding("o200k_base")
         except Exception:
@@ -118,7 +244,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self.search_entry = QtWidgets.QLineEdit()
         self.search_entry.setPlaceholderText("Filter items...")
         top_nav_layout.addWidget(self.search_entry)
-        self.search_entry.textChanged.connect(self.refresh_files)
+        self.search_entry.textChanged.connect(self._schedule_search_refresh)
         top_nav_layout.addStretch()
         main_layout.addLayout(top_nav_layout)
 
@@ -149,8 +275,8 @@ class FileConcatenator(QtWidgets.QMainWindow):
 
         for language_name in self.language_extensions.keys():
             item = QtWidgets.QListWidgetItem(language_name)
-            item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-            item.setCheckState(QtCore.Qt.CheckState.Checked)
+            item.setFlags(item.flags() | _USER_CHECKABLE)
+            item.setCheckState(_CHECKED)
             item.setData(self.LANGUAGE_ROLE, language_name)
             self.language_list_widget.addItem(item)
 
@@ -197,6 +323,12 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self.file_tree_widget.itemExpanded.connect(self.populate_children)
         self.file_tree_widget.itemChanged.connect(self.handle_check_change)
         self.file_tree_widget.setAlternatingRowColors(True)
+        # All rows share one height, so the view can lay out large directory
+        # levels without measuring every item
+        self.file_tree_widget.setUniformRowHeights(True)
+        self.file_tree_widget.setItemDelegate(
+            FileIconDelegate(self._get_file_icon, self.PATH_ROLE, self.file_tree_widget)
+        )
         main_layout.addWidget(self.file_tree_widget)
 
         # Add token status panel
@@ -254,29 +386,42 @@ class FileConcatenator(QtWidgets.QMainWindow):
         logger.debug("UI components initialized.")
 
     def get_selected_filter_sets(self) -> Tuple[Set[str], Set[str], bool]:
-        """Get the compiled sets of selected extensions and filenames."""
-        selected_exts: Set[str] = set()
-        selected_names: Set[str] = set()
-        handle_other = False
+        """Get the compiled sets of selected extensions and filenames.
 
+        The result is cached against the current checkbox state, so callers
+        must treat the returned sets as read-only.
+        """
+        checked_names: List[str] = []
+        mask = 0
         for i in range(self.language_list_widget.count()):
             item = self.language_list_widget.item(i)
             assert item is not None
-            if item.checkState() == QtCore.Qt.CheckState.Checked:
-                language_name = item.data(self.LANGUAGE_ROLE)
-                if language_name == "Other Text Files":
-                    handle_other = True
-                    continue
+            if item.checkState() == _CHECKED:
+                mask |= 1 << i
+                checked_names.append(item.data(self.LANGUAGE_ROLE))
+
+        cached = self._filter_sets_cache
+        if cached is not None and cached[0] == mask:
+            return cached[1]
 
-                if language_name in self.language_extensions:
-                    for e in self.language_extensions[language_name]:
-                        (selected_exts if e.startswith(".") else selected_names).add(
-                            e.lower()
-                        )
+        selected_exts: Set[str] = set()
+        selected_names: Set[str] = set()
+        handle_other = False
+        for language_name in checked_names:
+            if language_name in self.OTHER_LANGUAGES:
+                handle_other = True
+                continue
+
+            if language_name in self._lang_ext_sets:
+                exts, names = self._lang_ext_sets[language_name]
+                selected_exts |= exts
+                selected_names |= names
         logger.debug(
             f"Selected filters: {len(selected_exts)} extensions, {len(selected_names)} filenames, other={handle_other}"
         )
-        return selected_exts, selected_names, handle_other
+        result = (selected_exts, selected_names, handle_other)
+        self._filter_sets_cache = (mask, result)
+        return result
 
     def get_selected_language_names(self) -> List[str]:
         """Get names of selected language types for display purposes."""
@@ -284,7 +429,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         for i in range(self.language_list_widget.count()):
             item = self.language_list_widget.item(i)
             assert item is not None
-            if item.checkState() == QtCore.Qt.CheckState.Checked:
+            if item.checkState() == _CHECKED:
                 language_name = item.data(self.LANGUAGE_ROLE)
                 selected_names.append(language_name)
         return selected_names
@@ -297,7 +442,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         for i in range(self.language_list_widget.count()):
             item = self.language_list_widget.item(i)
             assert item is not None
-            item.setCheckState(QtCore.Qt.CheckState.Checked)
+            item.setCheckState(_CHECKED)
 
     def deselect_all_languages(self) -> None:
         """Deselect all language types."""
@@ -307,7 +452,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         for i in range(self.language_list_widget.count()):
             item = self.language_list_widget.item(i)
             assert item is not None
-            item.setCheckState(QtCore.Qt.CheckState.Unchecked)
+            item.setCheckState(_UNCHECKED)
 
     def select_code_only(self) -> None:
         """Select only programming language categories."""
@@ -333,9 +478,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
             assert item is not None
             language_name = item.data(self.LANGUAGE_ROLE)
             item.setCheckState(
-                QtCore.Qt.CheckState.Checked
-                if language_name in code_categories
-                else QtCore.Qt.CheckState.Unchecked
+                _CHECKED if language_name in code_categories else _UNCHECKED
             )
 
     def select_docs_config(self) -> None:
@@ -356,9 +499,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
             assert item is not None
             language_name = item.data(self.LANGUAGE_ROLE)
             item.setCheckState(
-                QtCore.Qt.CheckState.Checked
-                if language_name in docs_config_categories
-                else QtCore.Qt.CheckState.Unchecked
+                _CHECKED if language_name in docs_config_categories else _UNCHECKED
             )
 
     def update_ui_state(self) -> None:
@@ -437,16 +578,30 @@ class FileConcatenator(QtWidgets.QMainWindow):
     def populate_file_list(self) -> None:
         """Populate the tree widget with files and directories."""
         logger.debug("Populating file list.")
+        self._update_working_root()
+        # Results of scans started for the old tree are dropped on arrival
+        self._scan_generation += 1
+        self._pending_scans.clear()
+        self._set_scan_busy(False)
         self.file_tree_widget.clear()
         self.populate_directory(self.working_dir, None)
 
-    def add_dir_node(
-        self, parent_item: Optional[QtWidgets.QTreeWidgetItem], path: Path
-    ) -> QtWidgets.QTreeWidgetItem:
-        """Adds a directory node to the tree."""
+    def _update_working_root(self) -> None:
+        """Cache the resolved project root used for containment checks."""
+        self._working_resolved_str = str(self.working_dir.resolve())
+        self._working_prefix = self._working_resolved_str.rstrip(os.sep) + os.sep
+
+    def _is_within_root(self, resolved_str: str) -> bool:
+        """Check that a resolved path is the project root or lies below it."""
+        return resolved_str == self._working_resolved_str or resolved_str.startswith(
+            self._working_prefix
+        )
+
+    def create_dir_node(self, path: Path) -> QtWidgets.QTreeWidgetItem:
+        """Creates a directory node; the caller inserts it into the tree."""
         node = QtWidgets.QTreeWidgetItem([path.name])
-        node.setFlags(node.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-        node.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
+        node.setFlags(node.flags() | _USER_CHECKABLE)
+        node.setCheckState(0, _UNCHECKED)
         node.setData(0, self.PATH_ROLE, path)
         node.setIcon(
             0, self.icon_provider.icon(QtWidgets.QFileIconProvider.IconType.Folder)
@@ -454,16 +609,24 @@ class FileConcatenator(QtWidgets.QMainWindow):
         node.setChildIndicatorPolicy(
             QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator
         )
-        if parent_item:
-            parent_item.addChild(node)
-        else:
-            self.file_tree_widget.addTopLevelItem(node)
         return node
 
-    def add_file_node(
-        self, parent_item: Optional[QtWidgets.QTreeWidgetItem], path: Path
-    ) -> None:
-        """Adds a file node to the tree."""
+    def create_file_node(self, path: Path) -> QtWidgets.QTreeWidgetItem:
+        """Creates a file node; the caller inserts it into the tree."""
+        item = QtWidgets.QTreeWidgetItem([path.name])
+        item.setFlags(item.flags() | _USER_CHECKABLE)
+        item.setCheckState(0, _UNCHECKED)
+        item.setData(0, self.PATH_ROLE, path)
+        # The icon is looked up by FileIconDelegate when the row is painted
+        return item
+
+    def _get_file_icon(self, path: Path) -> QtGui.QIcon:
+        """Return the icon for a file, memoized by extension."""
+        icon_key = path.suffix.lower() or path.name.lower()
+        item_icon = self._icon_cache.get(icon_key)
+        if item_icon is not None:
+            return item_icon
+
         try:
             qfileinfo = QtCore.QFileInfo(str(path))
             specific_icon = self.icon_provider.icon(qfileinfo)
@@ -474,115 +637,152 @@ class FileConcatenator(QtWidgets.QMainWindow):
             if not specific_icon.isNull()
             else self.icon_provider.icon(QtWidgets.QFileIconProvider.IconType.File)
         )
-        item = QtWidgets.QTreeWidgetItem([path.name])
-        item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-        item.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
-        item.setData(0, self.PATH_ROLE, path)
-        item.setIcon(0, item_icon)
-        if parent_item:
-            parent_item.addChild(item)
-        else:
-            self.file_tree_widget.addTopLevelItem(item)
+        self._icon_cache[icon_key] = item_icon
+        return item_icon
 
     @QtCore.pyqtSlot(QtWidgets.QTreeWidgetItem)
     def populate_children(self, item: QtWidgets.QTreeWidgetItem) -> None:
         """Populates the children of a directory item when it's expanded."""
-        if item.childCount() > 0:
+        if item.childCount() > 0 or self._is_scan_pending(item):
             return
 
-        logger.debug(f"Populating children for item: {item.text(0)}")
-        blocked = self.file_tree_widget.signalsBlocked()
-        self.file_tree_widget.blockSignals(True)
         path: Path | None = item.data(0, self.PATH_ROLE)
+        if path and self._is_ignored_directory(path):
+            item.setChildIndicatorPolicy(
+                QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator
+            )
+            return
+
+        logger.debug(f"Populating children for item: {item.text(0)}")
         if path and path.is_dir():
             self.populate_directory(path, item)
-        state = item.checkState(0)
-        if state != QtCore.Qt.CheckState.PartiallyChecked:
-            self._set_children_check_state(item, state)
-        self._update_parent_check_state(item)
-        self.file_tree_widget.blockSignals(blocked)
-        parent = item.parent()
-        while parent:
-            self._update_parent_check_state(parent)
-            parent = parent.parent()
 
     def populate_directory(
         self, directory: Path, parent_item: Optional[QtWidgets.QTreeWidgetItem]
     ) -> None:
-        """Populate the tree widget with files and directories for one level."""
+        """
+        Start listing one directory level on the thread pool.
+
+        The nodes are added by _apply_scan_results once the scan finishes.
+        """
+        if self._is_ignored_directory(directory):
+            logger.debug(f"Skipping ignored directory: {directory}")
+            if parent_item:
+                parent_item.setChildIndicatorPolicy(
+                    QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator
+                )
+            return
         logger.debug(f"Populating directory: {directory}")
         selected_exts, selected_names, handle_other = self.get_selected_filter_sets()
-        search_text = self.search_entry.text().lower().strip()
-        try:
-            entries = []
-            for entry in os.scandir(directory):
-                item_path = Path(entry.path)
-                try:
-                    resolved = item_path.resolve()
-                    if not str(resolved).startswith(str(self.working_dir.resolve())):
-                        logger.warning(
-                            f"Rejected path outside project root: {resolved}"
-                        )
-                        continue
-                except Exception as e:
-                    logger.warning(f"Error resolving path {item_path}: {e}")
-                    continue
-                try:
-                    relative_path = item_path.relative_to(self.working_dir)
-                    relative_path_str_for_ignore = str(relative_path)
-                except ValueError:
-                    relative_path_str_for_ignore = entry.name
-                if entry.is_dir(
-                    follow_symlinks=False
-                ) and not relative_path_str_for_ignore.endswith("/"):
-                    relative_path_str_for_ignore += "/"
-                if self.ignore_spec and self.ignore_spec.match_file(
-                    relative_path_str_for_ignore
-                ):
-                    continue
-                if entry.name == "node_modules":
-                    continue
-                if (
-                    entry.name.startswith(".")
-                    and not self.include_hidden_files_checkbox.isChecked()
-                ):
-                    continue
-                if search_text and search_text not in entry.name.lower():
-                    continue
-                try:
-                    if not os.access(entry.path, os.R_OK):
-                        continue
-                    if entry.is_dir() and not os.access(entry.path, os.X_OK):
-                        continue
-                except OSError:
-                    continue
-                entries.append((entry, item_path))
-            entries.sort(
-                key=lambda x: (not x[0].is_dir(follow_symlinks=True), x[0].name.lower())
-            )
-            for entry, item_path in entries:
-                if entry.is_dir(follow_symlinks=True):
-                    self.add_dir_node(parent_item, item_path)
-                elif entry.is_file(follow_symlinks=True):
-                    if not (
-                        selected_exts or selected_names or handle_other
-                    ) or matches_file_type(
-                        item_path,
-                        selected_exts,
-                        selected_names,
-                        self.ALL_EXTENSIONS,
-                        self.ALL_FILENAMES,
-                        handle_other,
-                    ):
-                        self.add_file_node(parent_item, item_path)
-        except PermissionError as e:
-            logger.error(f"Permission denied accessing directory: {directory}. {e}")
+        request = ScanRequest(
+            directory=directory,
+            working_dir=self.working_dir,
+            root_str=self._working_resolved_str,
+            root_prefix=self._working_prefix,
+            ignore_match=self._ignore_match,
+            include_hidden=self.include_hidden_files_checkbox.isChecked(),
+            selected_exts=selected_exts,
+            selected_names=selected_names,
+            all_exts=self.ALL_EXTENSIONS,
+            all_names=self.ALL_FILENAMES,
+            handle_other=handle_other,
+        )
+        self._next_scan_id += 1
+        runnable = ScanRunnable(self._scan_generation, self._next_scan_id, request)
+        runnable.signals.finished.connect(self._apply_scan_results)
+        self._pending_scans[self._next_scan_id] = parent_item
+        self._set_scan_busy(True)
+        _start_in_thread_pool(runnable)
+
+    def _set_scan_busy(self, busy: bool) -> None:
+        """Show a busy cursor over the tree while directory scans are running."""
+        viewport = self.file_tree_widget.viewport()
+        if viewport is None:
+            return
+        if busy:
+            viewport.setCursor(QtCore.Qt.CursorShape.BusyCursor)
+        else:
+            viewport.unsetCursor()
+
+    def _is_scan_pending(self, item: QtWidgets.QTreeWidgetItem) -> bool:
+        """Check whether a scan for the item's children is still running."""
+        return any(pending is item for pending in self._pending_scans.values())
+
+    @QtCore.pyqtSlot(int, int, list, str)
+    def _apply_scan_results(
+        self, generation: int, scan_id: int, results: list, error: str
+    ) -> None:
+        """Build the tree nodes for a finished directory scan."""
+        if generation != self._scan_generation or scan_id not in self._pending_scans:
+            logger.debug(f"Dropping stale scan results (generation {generation})")
+            return
+        parent_item = self._pending_scans.pop(scan_id)
+        if not self._pending_scans:
+            self._set_scan_busy(False)
+
+        if error:
             if parent_item:
                 parent_item.setDisabled(True)
-        except Exception as e:
-            logger.error(f"Error listing directory {directory}: {e}", exc_info=True)
+            return
+
+        nodes: List[QtWidgets.QTreeWidgetItem] = [
+            self.create_dir_node(path) if is_dir else self.create_file_node(path)
+            for path, is_dir in results
+        ]
+        self._insert_nodes(parent_item, nodes)
+        # setHidden is ignored until an item is in the view, so rows loaded
+        # while a search is active are filtered after insertion
+        search = self._search_matcher()
+        if search is not None:
+            for node in nodes:
+                node.setHidden(search(node.text(0)) is None)
+        if parent_item is None:
+            return
+
+        # New children inherit the expanded item's check state
+        blocked = self.file_tree_widget.blockSignals(True)
+        try:
+            state = parent_item.checkState(0)
+            if state != _PARTIAL:
+                self._set_children_check_state(parent_item, state)
+            self._update_parent_check_state(parent_item)
+            self._propagate_check_state(parent_item, state, parent_item.checkState(0))
+        finally:
+            self.file_tree_widget.blockSignals(blocked)
+
+    def _is_ignored_directory(self, directory: Path) -> bool:
+        """Check whether a directory below the root is excluded as a whole."""
+        try:
+            relative_path = directory.relative_to(self.working_dir)
+        except ValueError:
+            return False
+        if not relative_path.parts:
+            return False
+        key = ignore_key(relative_path, True)
+        if self._ignore_match and self._ignore_match(key):
+            return True
+        return bool(
+            self.global_ignore_spec and self.global_ignore_spec.match_file(key)
+        )
+
+    def _insert_nodes(
+        self,
+        parent_item: Optional[QtWidgets.QTreeWidgetItem],
+        nodes: List[QtWidgets.QTreeWidgetItem],
+    ) -> None:
+        """Insert one directory level in a single batch with the view quiescent."""
+        if not nodes:
+            return
+        self.file_tree_widget.setUpdatesEnabled(False)
+        blocked = self.file_tree_widget.blockSignals(True)
+        try:
             if parent_item:
-                parent_item.setDisabled(True)
+                parent_item.addChildren(nodes)
+            else:
+                self.file_tree_widget.addTopLevelItems(nodes)
+        finally:
+            self.file_tree_widget.blockSignals(blocked)
+            self.file_tree_widget.setUpdatesEnabled(True)
 
     def handle_item_double_click(
         self, item: QtWidgets.QTreeWidgetItem, column: int
@@ -596,7 +796,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
             try:
                 st = os.stat(path_data)
                 if stat.S_ISDIR(st.st_mode):
-                    _ = list(os.scandir(path_data))
+                    self._check_directory_listable(path_data)
                     self.working_dir = path_data.resolve()
                     logger.info(f"Navigated into directory: {self.working_dir}")
                     self.refresh_files()
@@ -626,6 +826,16 @@ class FileConcatenator(QtWidgets.QMainWindow):
                     f"Could not open directory:\n{path_data.name}\n\n{e}",
                 )
 
+    @staticmethod
+    def _check_directory_listable(directory: Path) -> None:
+        """Raise PermissionError/FileNotFoundError if directory can't be opened.
+
+        Opening the directory is enough to surface access errors, so only the
+        first entry is read instead of materializing the whole listing.
+        """
+        with os.scandir(directory) as it:
+            next(it, None)
+
     def go_up_directory(self) -> None:
         """Navigate up."""
         logger.debug("Navigating up one directory.")
@@ -634,7 +844,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         parent_dir = self.working_dir.parent
         if parent_dir != self.working_dir:
             try:
-                _ = list(os.scandir(parent_dir))
+                self._check_directory_listable(parent_dir)
                 self.working_dir = parent_dir.resolve()
                 logger.info(f"Navigated up to directory: {self.working_dir}")
                 self.refresh_files()
@@ -678,37 +888,71 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self._set_all_items_checked(False)
 
     def _set_all_items_checked(self, checked: bool) -> None:
-        """Recursively set the checked state of all items."""
-        check_state = (
-            QtCore.Qt.CheckState.Checked if checked else QtCore.Qt.CheckState.Unchecked
-        )
+        """Set the checked state of all items."""
+        check_state = _CHECKED if checked else _UNCHECKED
+        # (item, depth below the top level)
+        stack: Deque[Tuple[QtWidgets.QTreeWidgetItem, int]] = deque()
         for i in range(self.file_tree_widget.topLevelItemCount()):
             item = self.file_tree_widget.topLevelItem(i)
-            if item is not None:
-                self._set_item_checked_recursive(item, check_state)
-
-    def _set_item_checked_recursive(
-        self, item: QtWidgets.QTreeWidgetItem, check_state: QtCore.Qt.CheckState
-    ) -> None:
-        """Recursively set the checked state of an item and its children."""
-        if item.flags() & QtCore.Qt.ItemFlag.ItemIsUserCheckable:
-            item.setCheckState(0, check_state)
-        for i in range(item.childCount()):
-            child = item.child(i)
-            if child is not None:
-                self._set_item_checked_recursive(child, check_state)
+            if item is not None and not item.isHidden():
+                stack.append((item, 0))
+
+        # Every item is set explicitly, so per-item change handling is redundant.
+        # Rows hidden by the search are left alone, so parents holding any,
+        # and all of their ancestors, are recounted afterwards, deepest first.
+        recount: Dict[int, Tuple[int, QtWidgets.QTreeWidgetItem]] = {}
+        blocked = self.file_tree_widget.blockSignals(True)
+        try:
+            while stack:
+                item, depth = stack.pop()
+                if item.flags() & _USER_CHECKABLE:
+                    item.setCheckState(0, check_state)
+                checkable, has_hidden = 0, False
+                for i in range(item.childCount()):
+                    child = item.child(i)
+                    if child is None:
+                        continue
+                    if child.isHidden():
+                        has_hidden = True
+                        continue
+                    if child.flags() & _USER_CHECKABLE:
+                        checkable += 1
+                    stack.append((child, depth + 1))
+                if has_hidden:
+                    ancestor: Optional[QtWidgets.QTreeWidgetItem] = item
+                    ancestor_depth = depth
+                    while ancestor is not None and id(ancestor) not in recount:
+                        recount[id(ancestor)] = (ancestor_depth, ancestor)
+                        ancestor = ancestor.parent()
+                        ancestor_depth -= 1
+                elif checkable:
+                    self._set_uniform_counts(item, checkable, check_state)
+            for _, item in sorted(
+                recount.values(), key=lambda entry: entry[0], reverse=True
+            ):
+                self._update_parent_check_state(item)
+        finally:
+            self.file_tree_widget.blockSignals(blocked)
+        self._schedule_token_update()
 
     def handle_check_change(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
         if column != 0:
             return
         logger.debug(f"Item '{item.text(0)}' check state changed.")
         state = item.checkState(0)
-        if state != QtCore.Qt.CheckState.PartiallyChecked:
+        if state != _PARTIAL:
             self._set_children_check_state(item, state)
         parent = item.parent()
-        while parent:
-            self._update_parent_check_state(parent)
-            parent = parent.parent()
+        if parent is not None:
+            # The item's previous state is unknown, so its parent is recounted;
+            # ancestors above it are then adjusted by delta
+            blocked = self.file_tree_widget.blockSignals(True)
+            try:
+                old_state = parent.checkState(0)
+                self._update_parent_check_state(parent)
+                self._propagate_check_state(parent, old_state, parent.checkState(0))
+            finally:
+                self.file_tree_widget.blockSignals(blocked)
 
         # Trigger token estimation update with debounce
         self._schedule_token_update()
@@ -754,7 +998,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
                                 d
                                 for d in dirs
                                 if not self.ignore_spec.match_file(
-                                    str(rel_root / d) + "/"
+                                    ignore_key(rel_root / d, True)
                                 )
                             ]
                         if self.global_ignore_spec:
@@ -762,13 +1006,17 @@ class FileConcatenator(QtWidgets.QMainWindow):
                                 d
                                 for d in dirs
                                 if not self.global_ignore_spec.match_file(
-                                    str(rel_root / d) + "/"
+                                    ignore_key(rel_root / d, True)
                                 )
                             ]
                     except ValueError:
                         pass
 
                     for fname in filenames:
+                        # Hidden files are rejected on the name alone,
+                        # before a Path is built for them
+                        if not include_hidden and fname.startswith("."):
+                            continue
                         file_path = root_path / fname
                         if self._should_count_file(
                             file_path,
@@ -899,95 +1147,207 @@ class FileConcatenator(QtWidgets.QMainWindow):
         )
         settings.setValue("token_budget", budget_key)
 
+    def _schedule_search_refresh(self) -> None:
+        """Restart the search debounce timer on each keystroke."""
+        self._search_timer.start()
+
+    def _search_matcher(self) -> Optional[Callable[[str], Optional[re.Match]]]:
+        """Return a case-insensitive matcher for the search text, if any."""
+        search_text = self.search_entry.text().strip()
+        if not search_text:
+            return None
+        return re.compile(re.escape(search_text), re.IGNORECASE).search
+
+    def _apply_search_filter(self) -> None:
+        """
+        Show only the rows whose names match the search text.
+
+        The loaded tree is filtered in place once typing pauses; nothing is
+        rescanned, and check states survive changes to the search.
+        """
+        if self.search_entry.text() == self._last_search:
+            return
+        self._last_search = self.search_entry.text()
+        search = self._search_matcher()
+        stack: Deque[QtWidgets.QTreeWidgetItem] = deque()
+        for i in range(self.file_tree_widget.topLevelItemCount()):
+            item = self.file_tree_widget.topLevelItem(i)
+            if item is not None:
+                stack.append(item)
+
+        self.file_tree_widget.setUpdatesEnabled(False)
+        try:
+            while stack:
+                item = stack.pop()
+                item.setHidden(search is not None and search(item.text(0)) is None)
+                for i in range(item.childCount()):
+                    child = item.child(i)
+                    if child is not None:
+                        stack.append(child)
+        finally:
+            self.file_tree_widget.setUpdatesEnabled(True)
+        self._schedule_token_update()
+
     def refresh_files(self) -> None:
         """Refresh list (reload ignores)."""
         logger.debug("Refreshing file list.")
         if self.is_generating:
             return
-        self.ignore_spec = load_ignore_patterns(
+        self._last_search = self.search_entry.text()
+        self._reload_ignore_spec()
+        # Clear token cache when directory changes or filters change
+        self.token_cache.clear()
+        self.populate_file_list()
+        self._schedule_token_update()
+
+    def _reload_ignore_spec(self) -> None:
+        """
+        Reload the ignore spec for the working directory.
+
+        load_ignore_patterns returns the same cached PathSpec while the ignore
+        files are unchanged, in which case the compiled matcher is kept too.
+        """
+        ignore_spec = load_ignore_patterns(
             self.working_dir,
             use_gitignore=self.use_gitignore_checkbox.isChecked(),
             use_npmignore=self.use_npmignore_checkbox.isChecked(),
             use_dockerignore=self.use_dockerignore_checkbox.isChecked(),
         )
-        # Clear token cache when directory changes or filters change
-        self.token_cache.clear()
-        self.populate_file_list()
-        self._schedule_token_update()
+        if ignore_spec is not self.ignore_spec:
+            self.ignore_spec = ignore_spec
+            self._ignore_match = build_ignore_matcher(ignore_spec)
 
     def _set_children_check_state(
         self, item: QtWidgets.QTreeWidgetItem, state: QtCore.Qt.CheckState
     ) -> None:
-        for i in range(item.childCount()):
-            child = item.child(i)
-            if child is not None:
-                if child.flags() & QtCore.Qt.ItemFlag.ItemIsUserCheckable:
-                    child.setCheckState(0, state)
-                self._set_children_check_state(child, state)
+        stack: Deque[QtWidgets.QTreeWidgetItem] = deque([item])
+        blocked = self.file_tree_widget.blockSignals(True)
+        try:
+            while stack:
+                current = stack.pop()
+                checkable = 0
+                for i in range(current.childCount()):
+                    child = current.child(i)
+                    if child is not None:
+                        if child.flags() & _USER_CHECKABLE:
+                            child.setCheckState(0, state)
+                            checkable += 1
+                        stack.append(child)
+                if checkable:
+                    self._set_uniform_counts(current, checkable, state)
+        finally:
+            self.file_tree_widget.blockSignals(blocked)
+
+    def _set_uniform_counts(
+        self,
+        item: QtWidgets.QTreeWidgetItem,
+        checkable: int,
+        state: QtCore.Qt.CheckState,
+    ) -> None:
+        """Record counters for an item whose checkable children all share state."""
+        checked = checkable if state == _CHECKED else 0
+        partial = checkable if state == _PARTIAL else 0
+        item.setData(0, self.COUNTS_ROLE, (checkable, checked, partial))
 
     def _update_parent_check_state(self, parent: QtWidgets.QTreeWidgetItem) -> None:
-        checked_count, total_count, has_partial = 0, 0, False
+        """Recount a parent's children and derive its check state."""
+        checked_count, total_count, partial_count = 0, 0, 0
         for i in range(parent.childCount()):
             child = parent.child(i)
-            if (
-                child is not None
-                and child.flags() & QtCore.Qt.ItemFlag.ItemIsUserCheckable
-            ):
+            if child is not None and child.flags() & _USER_CHECKABLE:
                 total_count += 1
                 child_state = child.checkState(0)
-                if child_state == QtCore.Qt.CheckState.Checked:
+                if child_state == _CHECKED:
                     checked_count += 1
-                elif child_state == QtCore.Qt.CheckState.PartiallyChecked:
-                    has_partial = True
-        if total_count == 0:
+                elif child_state == _PARTIAL:
+                    partial_count += 1
+        parent.setData(0, self.COUNTS_ROLE, (total_count, checked_count, partial_count))
+        self._apply_counts(parent, total_count, checked_count, partial_count)
+
+    @staticmethod
+    def _apply_counts(
+        item: QtWidgets.QTreeWidgetItem, total: int, checked: int, partial: int
+    ) -> None:
+        """Set an item's check state from its child counters."""
+        if total == 0:
             return
-        if checked_count == total_count and not has_partial:
-            parent.setCheckState(0, QtCore.Qt.CheckState.Checked)
-        elif checked_count == 0 and not has_partial:
-            parent.setCheckState(0, QtCore.Qt.CheckState.Unchecked)
+        if checked == total:
+            state = _CHECKED
+        elif checked == 0 and partial == 0:
+            state = _UNCHECKED
         else:
-            parent.setCheckState(0, QtCore.Qt.CheckState.PartiallyChecked)
+            state = _PARTIAL
+        if item.checkState(0) != state:
+            item.setCheckState(0, state)
 
-    def _collect_selected_paths(self, item: QtWidgets.QTreeWidgetItem) -> List[Path]:
-        """Recursively collect all checked file paths from the tree."""
-        paths: List[Path] = []
-        item_path = item.data(0, self.PATH_ROLE)
-        if item_path and isinstance(item_path, Path):
-            try:
-                resolved = item_path.resolve()
-                try:
-                    if not resolved.is_relative_to(self.working_dir.resolve()):
-                        logger.warning(
-                            f"Rejected path outside project root: {resolved}"
-                        )
-                        return paths
-                except AttributeError:
-                    try:
-                        working_dir_parts, resolved_parts = (
-                            self.working_dir.resolve().parts,
-                            resolved.parts,
-                        )
-                        if (
-                            resolved_parts[: len(working_dir_parts)]
-                            != working_dir_parts
-                        ):
-                            logger.warning(
-                                f"Rejected path outside project root (fallback): {resolved}"
-                            )
-                            return paths
-                    except Exception as e:
-                        logger.warning(f"Error in path comparison: {e}")
-                        return paths
-            except Exception as e:
-                logger.warning(f"Error resolving path {item_path}: {e}")
-                return paths
-            if item.checkState(0) == QtCore.Qt.CheckState.Checked:
-                paths.append(item_path)
+    def _propagate_check_state(
+        self,
+        item: QtWidgets.QTreeWidgetItem,
+        old_state: QtCore.Qt.CheckState,
+        new_state: QtCore.Qt.CheckState,
+    ) -> None:
+        """
+        Carry a child's check-state change up through its ancestors.
+
+        Each ancestor's counters are adjusted by the change instead of being
+        recounted, and the walk stops at the first ancestor whose own state
+        does not change.
+        """
+        parent = item.parent()
+        while parent is not None and old_state != new_state:
+            counts = parent.data(0, self.COUNTS_ROLE)
+            parent_old = parent.checkState(0)
+            if counts is None:
+                self._update_parent_check_state(parent)
             else:
-                for i in range(item.childCount()):
+                total, checked, partial = counts
+                checked += (new_state == _CHECKED) - (old_state == _CHECKED)
+                partial += (new_state == _PARTIAL) - (old_state == _PARTIAL)
+                parent.setData(0, self.COUNTS_ROLE, (total, checked, partial))
+                self._apply_counts(parent, total, checked, partial)
+            old_state, new_state = parent_old, parent.checkState(0)
+            parent = parent.parent()
+
+    def _collect_selected_paths(
+        self, items: List[QtWidgets.QTreeWidgetItem]
+    ) -> List[Path]:
+        """Collect all checked, visible paths below the given items, in tree order."""
+        # Walk the tree on the GUI thread without touching the filesystem;
+        # QTreeWidgetItem must not be read from other threads
+        candidates: List[Path] = []
+        stack: Deque[QtWidgets.QTreeWidgetItem] = deque(reversed(items))
+        while stack:
+            item = stack.pop()
+            if item.isHidden():
+                continue
+            item_path = item.data(0, self.PATH_ROLE)
+            if not item_path or not isinstance(item_path, Path):
+                continue
+            if item.checkState(0) == _CHECKED:
+                candidates.append(item_path)
+            else:
+                # Push children in reverse so they pop in display order
+                for i in range(item.childCount() - 1, -1, -1):
                     child = item.child(i)
                     if child is not None:
-                        paths.extend(self._collect_selected_paths(child))
+                        stack.append(child)
+
+        # Resolving is syscall-bound and releases the GIL, so large selections
+        # are checked against the project root on a few threads
+        if len(candidates) > _PARALLEL_RESOLVE_THRESHOLD:
+            executor = _get_resolve_executor()
+            resolved = list(executor.map(_resolve_or_none, candidates))
+        else:
+            resolved = [_resolve_or_none(path) for path in candidates]
+
+        paths: List[Path] = []
+        for item_path, resolved_str in zip(candidates, resolved):
+            if resolved_str is None:
+                continue
+            if not self._is_within_root(resolved_str):
+                logger.warning(f"Rejected path outside project root: {resolved_str}")
+                continue
+            paths.append(item_path)
         return paths
 
     def start_generate_file(self) -> None:
@@ -1018,10 +1378,10 @@ class FileConcatenator(QtWidgets.QMainWindow):
         self.progress_bar.setFormat("Starting...")
 
         filter_settings = FilterSettings(
-            selected_extensions=selected_exts,
-            selected_filenames=selected_names,
-            all_known_extensions=self.ALL_EXTENSIONS,
-            all_known_filenames=self.ALL_FILENAMES,
+            selected_extensions=frozenset(selected_exts),
+            selected_filenames=frozenset(selected_names),
+            all_known_extensions=frozenset(self.ALL_EXTENSIONS),
+            all_known_filenames=frozenset(self.ALL_FILENAMES),
             handle_other_text_files=handle_other,
             ignore_spec=self.ignore_spec,
             global_ignore_spec=self.global_ignore_spec,
@@ -1042,35 +1402,21 @@ class FileConcatenator(QtWidgets.QMainWindow):
         )
         logger.debug(f"WorkerConfig created: {worker_config}")
 
-        self.worker_thread = QtCore.QThread()
-        self.worker = GeneratorWorker(worker_config)
-        assert self.worker is not None and self.worker_thread is not None
-        self.worker.moveToThread(self.worker_thread)
-
-        self.worker.discovery_progress.connect(self.handle_discovery_progress)
-        self.worker.pre_count_finished.connect(self.handle_pre_count)
-        self.worker.progress_updated.connect(self.handle_progress_update)
-        self.worker.status_updated.connect(self.handle_status_update)
-        self.worker.finished.connect(self.handle_generation_finished)
-        self.worker_thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.worker_thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker_thread.finished.connect(self.worker_thread.deleteLater)
-        self.worker_thread.finished.connect(self.generation_cleanup)
-
-        logger.info("Starting generator thread...")
-        self.worker_thread.start()
+        self.worker = GeneratorTask(worker_config, self.generator_signals)
+
+        logger.info("Submitting generator task to the thread pool...")
+        _start_in_thread_pool(self.worker)
 
     def _collect_selected_paths_recursive(self) -> List[Path]:
         """Collect all selected paths from the tree widget."""
-        paths: List[Path] = []
+        top_level_items: List[QtWidgets.QTreeWidgetItem] = []
         for i in range(self.file_tree_widget.topLevelItemCount()):
             item = self.file_tree_widget.topLevelItem(i)
             if item is not None:
-                paths.extend(self._collect_selected_paths(item))
+                top_level_items.append(item)
             else:
                 logger.warning(f"Null item at index {i} in top level items")
-        return paths
+        return self._collect_selected_paths(top_level_items)
 
     @QtCore.pyqtSlot(int)
     def handle_pre_count(self, total_files: int) -> None:
@@ -1082,9 +1428,20 @@ class FileConcatenator(QtWidgets.QMainWindow):
 
     @QtCore.pyqtSlot(int)
     def handle_progress_update(self, value: int) -> None:
-        """Slot to handle the progress_updated signal."""
+        """Slot to handle the progress_updated signal.
+
+        Updates that arrive in a burst are collapsed into one setValue call.
+        """
         logger.debug(f"Progress update: {value}%")
-        self.progress_bar.setValue(value)
+        if self._pending_progress is None:
+            QtCore.QTimer.singleShot(0, self._flush_progress)
+        self._pending_progress = value
+
+    def _flush_progress(self) -> None:
+        """Apply the most recent progress value received from the task."""
+        if self._pending_progress is not None and self.is_generating:
+            self.progress_bar.setValue(self._pending_progress)
+        self._pending_progress = None
 
     @QtCore.pyqtSlot(str)
     def handle_discovery_progress(self, message: str) -> None:
@@ -1096,6 +1453,9 @@ class FileConcatenator(QtWidgets.QMainWindow):
     def handle_status_update(self, message: str) -> None:
         """Slot to handle the status_updated signal."""
         logger.info(f"Status update: {message}")
+        # The task's last status can arrive after generation_cleanup reset the bar
+        if not self.is_generating:
+            return
         self.progress_bar.setFormat(message + " %p%")
 
     @QtCore.pyqtSlot(str, list, str)
@@ -1144,10 +1504,9 @@ class FileConcatenator(QtWidgets.QMainWindow):
                 )
 
     def generation_cleanup(self) -> None:
-        """Slot called when the thread finishes, regardless of reason."""
-        logger.info("Generator thread finished signal received. Cleaning up.")
+        """Slot called when the task finishes, regardless of reason."""
+        logger.info("Generator task finished signal received. Cleaning up.")
         self.worker = None
-        self.worker_thread = None
         self.is_generating = False
         self.set_controls_enabled(True)
         self.progress_bar.setValue(0)
@@ -1168,7 +1527,7 @@ class FileConcatenator(QtWidgets.QMainWindow):
         if event is None:
             return
         logger.debug("Close event triggered.")
-        if self.is_generating and self.worker_thread and self.worker_thread.isRunning():
+        if self.is_generating and self.worker is not None:
             reply = QtWidgets.QMessageBox.question(
                 self,
                 "Confirm Exit",
@@ -1,10 +1,11 @@
-"""Background worker thread for file processing."""
+"""Background generation task for file processing."""
 
 import logging
 import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import List, TextIO, cast
+from typing import List, Optional, TextIO, cast
 
 from PyQt6 import QtCore
 
@@ -16,12 +17,13 @@ from source_stitcher.core.output_builder import HeaderBuilder, ContentStreamer
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for the output file; the text layer hands encoded data to
+# the OS in blocks this size rather than the default 8 KiB
+_OUTPUT_BUFFER_SIZE = 1 << 20
 
-class GeneratorWorker(QtCore.QObject):
-    """
-    Worker object to perform file discovery and processing in a separate thread.
-    Uses unified file walker to eliminate double directory traversal.
-    """
+
+class GeneratorSignals(QtCore.QObject):
+    """Signals emitted by GeneratorTask, which cannot define signals itself."""
 
     discovery_progress = QtCore.pyqtSignal(str)  # "Scanning..." status
     pre_count_finished = QtCore.pyqtSignal(int)  # Total file count
@@ -29,27 +31,61 @@ class GeneratorWorker(QtCore.QObject):
     status_updated = QtCore.pyqtSignal(str)  # Status messages
     finished = QtCore.pyqtSignal(str, list, str)  # temp_path, processed_files, error
 
-    def __init__(self, config: WorkerConfig) -> None:
+
+class GeneratorTask(QtCore.QRunnable):
+    """
+    Task that performs file discovery and processing.
+
+    The GUI submits it to QThreadPool.globalInstance() so pool threads are
+    reused across generations, and passes in one long-lived signals object
+    so its connections are made once; the CLI calls run() directly. Uses the
+    unified file walker to eliminate double directory traversal.
+    """
+
+    def __init__(
+        self, config: WorkerConfig, signals: Optional[GeneratorSignals] = None
+    ) -> None:
         super().__init__()
         self.config = config
-        self._is_cancelled = False
+        self.signals = signals if signals is not None else GeneratorSignals()
+        self._cancel_event = threading.Event()
+        self._last_progress = -1
+        self._last_status = ""
 
         # Initialize new components
         self.language_loader = LanguageDefinitionLoader(config.language_config_path)
         self.file_reader = FileReader(
             encodings=config.generation_options.encodings,
             default_encoding=config.generation_options.default_encoding,
+            binary_cache=config.binary_cache,
         )
 
         logger.debug(f"Worker initialized with config: {self.config}")
 
+    @property
+    def _is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
     def cancel(self) -> None:
-        """Signals the worker to stop processing."""
-        self._is_cancelled = True
-        logger.debug(f"Worker cancellation requested: {self._is_cancelled}")
+        """Signals the task to stop processing; safe to call from any thread."""
+        self._cancel_event.set()
         logger.info("Cancellation requested for worker.")
 
-    @QtCore.pyqtSlot()
+    def _report_progress(self, pct: int) -> None:
+        """Forward streaming progress, emitting only when the percentage changes."""
+        pct = min(pct, 99)
+        if self._is_cancelled or pct == self._last_progress:
+            return
+        self._last_progress = pct
+        self.signals.progress_updated.emit(pct)
+
+    def _report_status(self, message: str) -> None:
+        """Forward a status message unless it repeats the previous one."""
+        if message == self._last_status:
+            return
+        self._last_status = message
+        self.signals.status_updated.emit(message)
+
     def run(self) -> None:
         """Main execution method using streamlined single-pass architecture."""
         error_message = ""
@@ -62,27 +98,27 @@ class GeneratorWorker(QtCore.QObject):
 
         try:
             # Phase 1: Discovery - Single directory traversal to find all matching files
-            self.status_updated.emit("Scanning files...")
+            self._report_status("Scanning files...")
             logger.debug("Starting unified discovery phase")
 
             def progress_callback(message: str):
-                self.discovery_progress.emit(message)
+                self.signals.discovery_progress.emit(message)
 
             file_walker = ProjectFileWalker(self.config, progress_callback)
             file_list, total_count = file_walker.discover_files()
 
             if self._is_cancelled:
                 logger.info("Worker cancelled during discovery phase.")
-                self.finished.emit("", [], "Operation cancelled.")
+                self.signals.finished.emit("", [], "Operation cancelled.")
                 return
 
             if total_count == 0:
                 logger.info("No matching files found.")
-                self.finished.emit("", [], "No matching files found.")
+                self.signals.finished.emit("", [], "No matching files found.")
                 return
 
             logger.info(f"Discovery completed: {total_count} files found")
-            self.pre_count_finished.emit(total_count)
+            self.signals.pre_count_finished.emit(total_count)
 
             # Phase 2: Build header once before any file content is written
             logger.debug("Building header")
@@ -94,33 +130,32 @@ class GeneratorWorker(QtCore.QObject):
             header = header_builder.build()
 
             # Phase 3: Stream content directly to temp file in single pass
-            self.status_updated.emit("Processing files...")
+            self._report_status("Processing files...")
             logger.debug("Starting single-pass content streaming")
-            processing_start_time = time.time()
+            processing_start_time = time.monotonic()
 
             # Open temp file once and write everything in order
             with tempfile.NamedTemporaryFile(
-                suffix=".md", delete=False, mode="w", encoding="utf-8"
+                suffix=".md",
+                delete=False,
+                mode="w",
+                encoding="utf-8",
+                buffering=_OUTPUT_BUFFER_SIZE,
             ) as fh:
                 temp_path = fh.name
 
                 # Write header first
                 fh.write(header)
-                fh.flush()
 
                 # Stream file content directly
                 content_streamer = ContentStreamer(self.file_reader, cast(TextIO, fh))
                 files_processed_count, processed_files = content_streamer.stream_files(
                     file_list,
                     self.config.generation_options.base_directory,
-                    lambda pct: (
-                        self.progress_updated.emit(min(pct, 99))
-                        if not self._is_cancelled
-                        else None
-                    ),
+                    self._report_progress,
                 )
 
-            processing_end_time = time.time()
+            processing_end_time = time.monotonic()
             logger.debug(
                 f"Processing phase finished in {processing_end_time - processing_start_time:.2f}s"
             )
@@ -132,14 +167,14 @@ class GeneratorWorker(QtCore.QObject):
                 logger.info("Worker cancelled during processing phase.")
                 if temp_path and Path(temp_path).exists():
                     Path(temp_path).unlink()
-                self.finished.emit("", [], "Operation cancelled.")
+                self.signals.finished.emit("", [], "Operation cancelled.")
                 return
 
             if not error_message:
-                self.progress_updated.emit(100)
+                self.signals.progress_updated.emit(100)
 
             # Emit success with processed file list
-            self.finished.emit(temp_path, processed_files, "")
+            self.signals.finished.emit(temp_path, processed_files, "")
 
         except Exception as e:
             logger.error(f"Worker error: {e}", exc_info=True)
@@ -149,7 +184,7 @@ class GeneratorWorker(QtCore.QObject):
             if temp_path and Path(temp_path).exists():
                 Path(temp_path).unlink()
 
-            self.finished.emit("", [], error_message)
+            self.signals.finished.emit("", [], error_message)
 
         finally:
-            self.status_updated.emit("Finished")
+            self._report_status("Finished")